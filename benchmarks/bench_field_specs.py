@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: the compiled station field matcher on both of its sources.
+Times STATION_MATCHER.scan_text over synthetic fuel book station blocks
+(the PDF path) and STATION_MATCHER.scan_labels over the matching review
+card detail lines (the HTML path), in records per second.
+
+Usage: python benchmarks/bench_field_specs.py [--stations 40] [--pages 200]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from station_patterns import STATION_MATCHER, STATION_PATTERN
+from synthetic import station_fields, synthetic_page
+
+
+def station_blocks(text):
+    """(start, end) of each station block on a page."""
+    starts = [match.start() for match in STATION_PATTERN.finditer(text)]
+    return list(zip(starts, starts[1:] + [len(text)]))
+
+
+def detail_lines(i, number):
+    """Detail div texts of a review card, as make_review_html writes them."""
+    station = station_fields(i, number)
+    return [f"Address: {station['address']}", f"Location: {station['city_state_zip']}",
+            f"Exit: {station['exit_info']}", f"Phone: {station['phone']}",
+            f"NaviGo ID: {station['navigo_id']}", f"Fax: {station['fax']}"]
+
+
+def records_per_second(scan, records, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for record in records:
+            scan(record)
+        best = min(best, time.perf_counter() - start)
+    return len(records) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the station field matcher")
+    parser.add_argument('--stations', type=int, default=40, help="Stations per page")
+    parser.add_argument('--pages', type=int, default=200, help="Pages per run")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs (best is reported)")
+    args = parser.parse_args()
+
+    blocks = []
+    for seed in range(args.pages):
+        text = synthetic_page(args.stations, seed)
+        blocks += [(text, start, end) for start, end in station_blocks(text)]
+    cards = [detail_lines(i, seed * args.stations + i)
+             for seed in range(args.pages) for i in range(args.stations)]
+
+    def scan_block(block):
+        text, start, end = block
+        return STATION_MATCHER.scan_text(text, None, start, end)
+
+    text_rate = records_per_second(scan_block, blocks, args.repeat)
+    label_rate = records_per_second(STATION_MATCHER.scan_labels, cards, args.repeat)
+    print(f"{len(blocks)} station blocks, {len(cards)} review cards")
+    print(f"  scan_text   (PDF):  {text_rate:12.1f} stations/sec")
+    print(f"  scan_labels (HTML): {label_rate:12.1f} stations/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark on synthetic inputs.
+Generates a fuel book PDF and a review HTML of the requested size, then
+times extract_fuel_stations, PDFExtractor.extract_all and
+extract_fuel_data_from_html. Each stage reports its best wall time,
+pages/sec, stations/sec, tracemalloc peak and the peak RSS of a fresh
+process running the stage once (so an earlier, heavier stage does not
+show up in later ones). Results are written as JSON so runs can be
+compared between commits.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--state-pages 200] [--output results.json]
+    python benchmarks/bench_pipeline.py --compare before.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from extract_fuel_data import extract_fuel_stations
+from extract_from_html import extract_fuel_data_from_html
+from pdf_extractor import PDFExtractor
+from synthetic import make_fuel_book_pdf, make_review_html
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process, in MB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def count_records(data):
+    return sum(len(info['fuel_stations']) + len(info['terminals']) for info in data.values())
+
+
+def stage_rss_mb(args, workdir, name):
+    """Peak RSS of a fresh interpreter that runs one stage once."""
+    if resource is None:
+        return None
+    command = [sys.executable, __file__, '--rss-stage', name, '--workdir', str(workdir),
+               '--workers', str(args.workers)]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def run_stage(fn, repeat, pages, count=count_records):
+    """Time fn() (best of repeat), then rerun once under tracemalloc.
+
+    count(result) gives the number of stations and terminals extracted.
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stations = count(result) if count else None
+    return {
+        'seconds': round(best, 4),
+        'pages': pages,
+        'pages_per_sec': round(pages / best, 1) if pages else None,
+        'stations': stations,
+        'stations_per_sec': round(stations / best, 1) if stations else None,
+        'tracemalloc_peak_mb': round(traced_peak / (1024 * 1024), 2),
+    }
+
+
+def stage_functions(args, workdir):
+    """Stage name -> (fn, counts stations) for inputs already in workdir."""
+    pdf_path = workdir / 'synthetic_fuel_book.pdf'
+    html_path = workdir / 'synthetic_review.html'
+    stages = {'extract_fuel_stations': (lambda: extract_fuel_stations(pdf_path), True)}
+    if args.workers != 1:
+        stages[f'extract_fuel_stations[workers={args.workers}]'] = (
+            lambda: extract_fuel_stations(pdf_path, workers=args.workers), True)
+    stages['extract_fuel_stations[layout]'] = (
+        lambda: extract_fuel_stations(pdf_path, parser='layout'), True)
+    stages['PDFExtractor.extract_all'] = (
+        lambda: PDFExtractor(pdf_path).extract_all(workdir / 'extract_all'), False)
+    stages['extract_fuel_data_from_html'] = (lambda: extract_fuel_data_from_html(html_path), True)
+    return stages
+
+
+def run_benchmarks(args, workdir):
+    page_count = make_fuel_book_pdf(workdir / 'synthetic_fuel_book.pdf', args.state_pages,
+                                    args.stations_per_page)
+    make_review_html(workdir / 'synthetic_review.html', args.html_states, args.stations_per_state)
+
+    stages = {}
+    for name, (fn, counts_stations) in stage_functions(args, workdir).items():
+        pages = None if name == 'extract_fuel_data_from_html' else page_count
+        stages[name] = run_stage(fn, args.repeat, pages, count_records if counts_stations else None)
+        stages[name]['peak_rss_mb'] = stage_rss_mb(args, workdir, name)
+    return stages
+
+
+def compare(results, baseline):
+    """Print per-stage speedups of results against a baseline results file."""
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for name, stage in results['stages'].items():
+        before = baseline['stages'].get(name)
+        if not before:
+            print(f"  {name:<40} (new stage)")
+            continue
+        print(f"  {name:<40} {before['seconds'] / stage['seconds']:5.2f}x speedup, "
+              f"tracemalloc {before['tracemalloc_peak_mb']} -> {stage['tracemalloc_peak_mb']} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the extraction pipeline on synthetic inputs")
+    parser.add_argument('--state-pages', type=int, default=100, help="State pages in the synthetic PDF")
+    parser.add_argument('--stations-per-page', type=int, default=8, help="Stations per state page")
+    parser.add_argument('--html-states', type=int, default=50, help="State sections in the synthetic HTML")
+    parser.add_argument('--stations-per-state', type=int, default=40, help="Stations per HTML state section")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Workers for the parallel extract_fuel_stations stage (0 = all cores, 1 = skip)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per stage (best is reported)")
+    parser.add_argument('--output', help="Results JSON (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', help="Earlier results JSON to compare against")
+    parser.add_argument('--rss-stage', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.rss_stage:
+        # Child process of stage_rss_mb: run one stage once, print its peak RSS
+        fn, _ = stage_functions(args, Path(args.workdir))[args.rss_stage]
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        print(json.dumps(peak_rss_mb()))
+        return
+
+    commit = git_commit()
+    with tempfile.TemporaryDirectory() as tmp:
+        stages = run_benchmarks(args, Path(tmp))
+
+    results = {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'params': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'stages': stages,
+    }
+
+    for name, stage in stages.items():
+        rates = []
+        if stage['pages_per_sec']:
+            rates.append(f"{stage['pages_per_sec']:9.1f} pages/s")
+        if stage['stations_per_sec']:
+            rates.append(f"{stage['stations_per_sec']:10.1f} stations/s")
+        print(f"{name:<40} {stage['seconds']:8.3f}s  {'  '.join(rates)}  "
+              f"peak {stage['tracemalloc_peak_mb']} MB traced")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📄 Results saved to: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
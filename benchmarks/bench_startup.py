@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: module import time, measured with python -X importtime.
+Imports each entry point in a fresh interpreter and reports the median
+cumulative import time plus the heaviest imports it pulled in, so a
+backend that sneaks back into module load shows up immediately.
+
+Usage: python benchmarks/bench_startup.py [pdf_extractor extract_fuel_data] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = ('pdf_extractor', 'extract_fuel_data', 'example_usage')
+
+# Libraries that should only be imported when an extraction needs them
+HEAVY_MODULES = ('fitz', 'pymupdf', 'pdfplumber', 'pypdf', 'pdfminer', 'pandas', 'pyarrow')
+
+
+def import_times(module):
+    """Run one fresh import; returns {imported module: cumulative microseconds}."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark module import time")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per module (median is reported)")
+    parser.add_argument('--top', type=int, default=5, help="Heaviest imports to list per module")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        total = statistics.median(run[module] for run in runs)
+        last = runs[-1]
+        heavy = [name for name in HEAVY_MODULES if name in last]
+        print(f"{module}: {total / 1000:8.1f} ms")
+        print(f"  heavy backends loaded: {', '.join(heavy) if heavy else 'none'}")
+        for name, cumulative in sorted(last.items(), key=lambda item: -item[1])[1:args.top + 1]:
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: station page parsing, pages per second.
+Compares the compiled single-scan parse_fuel_stations against the previous
+per-match re.search implementation on synthetic fuel book pages.
+
+Usage: python benchmarks/bench_station_parser.py [--stations 40] [--pages 200]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from extract_fuel_data import parse_fuel_stations
+from synthetic import synthetic_page
+
+
+# Previous implementation, kept verbatim for the "before" numbers
+def legacy_parse_fuel_stations(text, state, page_num):
+    """Parse fuel station entries from a page."""
+    stations = []
+    
+    # Pattern to match station entries: #123 TA Location or #123 Petro Location
+    station_pattern = r'#([0-9]{3})\s+(TA|Petro)\s+([^\n]+)'
+    matches = re.finditer(station_pattern, text)
+    
+    for match in matches:
+        station = {
+            'page': page_num,
+            'state': state,
+            'number': match.group(1),
+            'type': match.group(2),
+            'name': f"#{match.group(1)} {match.group(2)} {match.group(3).strip()}"
+        }
+        
+        # Extract full details for this station
+        # Find the text block for this specific station
+        start_pos = match.start()
+        # Find next station or end of relevant text
+        next_match = re.search(r'#[0-9]{3}\s+(TA|Petro)', text[start_pos + 20:])
+        end_pos = start_pos + next_match.start() + 20 if next_match else len(text)
+        station_block = text[start_pos:end_pos]
+        
+        # Extract address and city/state/zip
+        # Some stations have: Name → Address → City,ST ZIP
+        # Others have: Name → City,ST ZIP → Address (swapped!)
+        lines = station_block.split('\n')
+        
+        # Check which line has city/state/zip format (contains comma and state abbreviation)
+        city_state_zip_line = None
+        address_line = None
+        
+        if len(lines) > 1:
+            line1 = lines[1].strip()
+            line2 = lines[2].strip() if len(lines) > 2 else ''
+            
+            # City/state/zip format: "City, ST ZIP" (has comma and 2-letter state)
+            if ',' in line1 and re.search(r',\s*[A-Z]{2}\s+[0-9]{5}', line1):
+                city_state_zip_line = line1
+                address_line = line2
+            elif ',' in line2 and re.search(r',\s*[A-Z]{2}\s+[0-9]{5}', line2):
+                address_line = line1
+                city_state_zip_line = line2
+            else:
+                # Fallback: assume standard format
+                address_line = line1
+                city_state_zip_line = line2
+        
+        if address_line:
+            station['address'] = address_line
+        if city_state_zip_line:
+            station['city_state_zip'] = city_state_zip_line
+        
+        if len(lines) > 3:
+            station['exit_info'] = lines[3].strip()
+        
+        # Extract phone/fax
+        phone_match = re.search(r'Ph:\s*(\([0-9]{3}\)\s*[0-9]{3}-[0-9]{4})', station_block)
+        if phone_match:
+            station['phone'] = phone_match.group(1)
+        
+        fax_match = re.search(r'Fx:\s*(\([0-9]{3}\)\s*[0-9]{3}-[0-9]{4})', station_block)
+        if fax_match:
+            station['fax'] = fax_match.group(1)
+        
+        # Extract NaviGo ID
+        navigo_match = re.search(r'NaviGo:\s*([A-Z0-9-]+)', station_block)
+        if navigo_match:
+            station['navigo_id'] = navigo_match.group(1)
+        
+        # Determine site type from symbols
+        if '★' in station_block:
+            station['site_type'] = 'Exclusive'
+        elif '●' in station_block:
+            # Check if it says "Primary" or "Limited" nearby
+            if 'Primary' in station_block:
+                station['site_type'] = 'Primary'
+            elif 'Limited' in station_block:
+                station['site_type'] = 'Limited'
+            else:
+                station['site_type'] = 'Primary'  # Default for ●
+        else:
+            station['site_type'] = 'Unknown'
+        
+        stations.append(station)
+    
+    return stations
+
+
+def pages_per_second(parse, pages, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page_num, text in enumerate(pages, 1):
+            parse(text, 'TEXAS', page_num)
+        best = min(best, time.perf_counter() - start)
+    return len(pages) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parse_fuel_stations")
+    parser.add_argument('--stations', type=int, default=40, help="Stations per page")
+    parser.add_argument('--pages', type=int, default=200, help="Pages per run")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs (best is reported)")
+    args = parser.parse_args()
+
+    pages = [synthetic_page(args.stations, seed) for seed in range(args.pages)]
+    assert parse_fuel_stations(pages[0], 'TEXAS', 1) == legacy_parse_fuel_stations(pages[0], 'TEXAS', 1)
+
+    before = pages_per_second(legacy_parse_fuel_stations, pages, args.repeat)
+    after = pages_per_second(parse_fuel_stations, pages, args.repeat)
+    print(f"{args.stations} stations/page, {args.pages} pages")
+    print(f"  before: {before:10.1f} pages/sec")
+    print(f"  after:  {after:10.1f} pages/sec  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
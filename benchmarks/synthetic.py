@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Synthetic fuel book inputs for the benchmarks.
+Generates page text, PDFs and review HTML shaped like the real fuel book
+(cover and intro pages, a Covenant terminal page, one state per page)
+at any size, so benchmarks never need the proprietary PDF.
+"""
+
+import html
+
+# (state, abbreviation) cycled through by the generators
+STATES = [
+    ('ALABAMA', 'AL'), ('ARIZONA', 'AZ'), ('ARKANSAS', 'AR'), ('CALIFORNIA', 'CA'),
+    ('GEORGIA', 'GA'), ('ILLINOIS', 'IL'), ('INDIANA', 'IN'), ('KANSAS', 'KS'),
+    ('NEW MEXICO', 'NM'), ('OHIO', 'OH'), ('PENNSYLVANIA', 'PA'), ('TEXAS', 'TX'),
+    ('VIRGINIA', 'VA'), ('WEST VIRGINIA', 'WV'), ('WYOMING', 'WY'),
+]
+
+# Pages before the first terminal page (cover + intro), as in the real book
+INTRO_PAGES = 9
+
+
+def station_fields(i, number, abbrev='TX'):
+    """Field values of the i-th synthetic station on a page."""
+    brand = 'TA' if i % 2 else 'Petro'
+    return {
+        'number': f"{number % 1000:03d}",
+        'brand': brand,
+        'name': f"Station {i}",
+        'address': f"{100 + i} Interstate Drive",
+        'city_state_zip': f"Town {i}, {abbrev} {75000 + i:05d}",
+        'exit_info': f"I-{10 + i % 80}, Exit {i + 1}",
+        'phone': f"(512) 555-{i % 10000:04d}",
+        'fax': f"(512) 556-{i % 10000:04d}",
+        'navigo_id': f"CVEN-{brand.upper()}{number % 1000:03d}",
+        'site_type': ('Exclusive', 'Limited', 'Primary')[i % 3],
+    }
+
+
+def synthetic_page(station_count, seed=0, state='TEXAS', abbrev='TX'):
+    """Page text shaped like a fuel book state page."""
+    lines = [state, "SITE TYPE KEY", "★ Exclusive ● Primary ● Limited"]
+    for i in range(station_count):
+        station = station_fields(i, seed * station_count + i, abbrev)
+        marker = {'Exclusive': '★', 'Limited': '● Limited', 'Primary': '● Primary'}[station['site_type']]
+        lines += [
+            f"#{station['number']} {station['brand']} {station['name']}",
+            station['address'],
+            station['city_state_zip'],
+            station['exit_info'],
+            f"Ph: {station['phone']} Fx: {station['fax']}",
+            f"NaviGo: {station['navigo_id']}",
+            marker,
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def terminal_page(index=0):
+    """Page text of one Covenant terminal."""
+    return "\n".join([
+        f"Covenant Logistics: Terminal {index}, TN",
+        f"{400 + index} Birmingham Hwy, Chattanooga, TN 37419",
+        f"Phone: (423) 821-{index % 10000:04d}",
+        f"NAVIGO ID: CVEN-T{index:03d}",
+        "AMENITIES:",
+        "- Showers",
+        "- Laundry",
+        "SHOWERS: 4",
+        "PARKING SPOTS: 120",
+        "SHOP: YES",
+    ]) + "\n"
+
+
+def make_fuel_book_pdf(path, state_pages=50, stations_per_page=8, terminal_pages=1):
+    """Write a synthetic fuel book PDF; returns its page count."""
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+
+    def add_page(text):
+        page = doc.new_page()
+        page.insert_text((36, 36), text, fontsize=7, lineheight=1.2)
+
+    add_page("Covenant Fuel Book\nLast Revised 3-2023-2\n")
+    for i in range(INTRO_PAGES - 1):
+        add_page(f"Introduction page {i + 1}\n")
+    for i in range(terminal_pages):
+        add_page(terminal_page(i))
+    for i in range(state_pages):
+        state, abbrev = STATES[i % len(STATES)]
+        add_page(synthetic_page(stations_per_page, seed=i, state=state, abbrev=abbrev))
+    page_count = doc.page_count
+    doc.save(path)
+    doc.close()
+    return page_count
+
+
+def make_review_html(path, states=50, stations_per_state=20, terminals=5):
+    """Write a synthetic fuel_stations_review.html; returns the station count."""
+    parts = ['<!DOCTYPE html>\n<html lang="en">\n<head><meta charset="UTF-8">'
+             '<title>Covenant Fuel Stations - Complete Data Review</title></head>\n'
+             '<body>\n<div class="container">\n']
+    for i in range(states):
+        state, abbrev = STATES[i % len(STATES)]
+        parts.append(f'<div class="state-section" data-state="{state.lower()}">\n'
+                     f'<div class="state-header"><span>📍 {state}</span>'
+                     f'<span>{stations_per_state} stations</span></div>\n'
+                     '<div class="stations-grid">\n')
+        for j in range(stations_per_state):
+            station = station_fields(j, i * stations_per_state + j, abbrev)
+            brand = station['brand']
+            site_type = station['site_type']
+            details = [('Address', station['address']), ('Location', station['city_state_zip']),
+                       ('Exit', station['exit_info']), ('Phone', station['phone']),
+                       ('NaviGo ID', station['navigo_id']), ('Fax', station['fax'])]
+            parts.append(
+                f'<div class="station-card" data-brand="{brand.lower()}" data-site-type="{site_type.lower()}">\n'
+                f'<div class="station-header"><div class="station-name">'
+                f'#{station["number"]} {brand} {html.escape(station["name"])}</div>'
+                f'<div class="brand-badge brand-{brand.lower()}">{brand}</div></div>\n'
+                f'<div class="site-type {site_type.lower()}">{site_type}</div>\n'
+                '<div class="station-details">\n'
+                + "".join(f'<div><span class="label">{label}:</span> {html.escape(value)}</div>\n'
+                          for label, value in details)
+                + '</div>\n</div>\n')
+        parts.append('</div>\n</div>\n')
+
+    parts.append('<h2>COVENANT LOGISTICS TERMINALS</h2>\n<div class="covenant-section">\n')
+    for i in range(terminals):
+        parts.append(f'<div class="terminal-card"><div class="terminal-name">Covenant Logistics: Terminal {i}</div>\n'
+                     f'<div class="terminal-details"><div>Address: {400 + i} Birmingham Hwy, Chattanooga, TN 37419</div>'
+                     f'<div>Phone: (423) 821-{i:04d}</div><div>NaviGo ID: CVEN-T{i:03d}</div></div></div>\n')
+    parts.append('</div>\n</div>\n</body>\n</html>\n')
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("".join(parts))
+    return states * stations_per_state
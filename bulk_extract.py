@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Bulk fuel book extraction.
+Takes directories and/or glob patterns, skips byte-identical files, runs
+extract_fuel_stations on each distinct PDF in a process pool and writes
+one merged dataset plus a per-file manifest.
+
+Usage:
+    python bulk_extract.py pdfs/ "incoming/2024-*/*.pdf" --workers 4
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from dedupe import dedupe_stations, print_summary, report_path, write_report
+from extract_fuel_data import PARSERS, extract_fuel_stations
+from extraction_cache import ExtractionCache, file_hash
+from pdf_session import resolve_workers
+
+GLOB_CHARS = set('*?[')
+
+
+def find_pdfs(inputs):
+    """Expand directories (recursively) and glob patterns into PDF paths."""
+    paths = []
+    seen = set()
+    for pattern in inputs:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(path.rglob('*.pdf'))
+        elif GLOB_CHARS & set(pattern):
+            matches = sorted(Path(match) for match in glob.glob(pattern, recursive=True))
+        else:
+            matches = [path]
+        for match in matches:
+            key = match.resolve()
+            if key not in seen:
+                seen.add(key)
+                paths.append(match)
+    return paths
+
+
+def source_names(paths):
+    """Source tag of each path: its path relative to the directory all
+    inputs share, so same-named files in different directories stay apart."""
+    paths = [Path(path).resolve() for path in paths]
+    if not paths:
+        return []
+    root = Path(os.path.commonpath([str(path.parent) for path in paths]))
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+def _extract_file(pdf_path, parser, use_cache):
+    """Process-pool worker: extract one PDF; returns (data, seconds)."""
+    start = time.perf_counter()
+    if use_cache:
+        with ExtractionCache() as cache:
+            data = extract_fuel_stations(pdf_path, cache=cache, parser=parser)
+    else:
+        data = extract_fuel_stations(pdf_path, parser=parser)
+    return data, time.perf_counter() - start
+
+
+def merge_datasets(results):
+    """Merge per-file datasets region by region, tagging stations with their source."""
+    merged = {}
+    for source, data in results:
+        for region, info in data.items():
+            target = merged.setdefault(region, {'terminals': [], 'fuel_stations': []})
+            target['terminals'].extend({**terminal, 'source': source} for terminal in info['terminals'])
+            target['fuel_stations'].extend({**station, 'source': source}
+                                           for station in info['fuel_stations'])
+    # Covenant terminals stay last, as in a single-file extraction
+    if 'COVENANT_TERMINALS' in merged:
+        merged['COVENANT_TERMINALS'] = merged.pop('COVENANT_TERMINALS')
+    return merged
+
+
+def progress(done, total, label):
+    print(f"\r  [{done}/{total}] {label[:60]:<60}", end='', flush=True)
+
+
+def bulk_extract(pdf_paths, workers=None, parser='text', use_cache=True):
+    """Extract many PDFs; returns (merged data, manifest entries in input order)."""
+    entries = []
+    first_by_hash = {}
+    pending = {}  # index into entries -> path to extract
+    for pdf_path in pdf_paths:
+        entry = {'path': str(pdf_path)}
+        try:
+            entry['sha256'] = file_hash(pdf_path)
+        except OSError as e:
+            entry.update(status='error', error=str(e))
+            entries.append(entry)
+            continue
+        if entry['sha256'] in first_by_hash:
+            entry.update(status='duplicate', duplicate_of=first_by_hash[entry['sha256']])
+        else:
+            first_by_hash[entry['sha256']] = entry['path']
+            pending[len(entries)] = pdf_path
+        entries.append(entry)
+
+    results = {}
+    total = len(pending)
+    with ProcessPoolExecutor(max_workers=min(resolve_workers(workers), max(total, 1))) as pool:
+        futures = {pool.submit(_extract_file, str(pdf_path), parser, use_cache): index
+                   for index, pdf_path in pending.items()}
+        for done, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            entry = entries[index]
+            try:
+                data, seconds = future.result()
+            except Exception as e:
+                entry.update(status='error', error=f"{type(e).__name__}: {e}")
+            else:
+                results[index] = data
+                entry.update(
+                    status='ok',
+                    seconds=round(seconds, 3),
+                    stations=sum(len(info['fuel_stations']) for info in data.values()),
+                    terminals=sum(len(info['terminals']) for info in data.values())
+                )
+            progress(done, total, Path(entry['path']).name)
+    if total:
+        print()
+
+    sources = source_names(entry['path'] for entry in entries)
+    merged = merge_datasets((sources[index], results[index]) for index in sorted(results))
+    return merged, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract fuel station data from many fuel book PDFs")
+    parser.add_argument('inputs', nargs='+', help="PDF files, directories or glob patterns")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Worker processes, one file each (default: all cores)")
+    parser.add_argument('--parser', choices=PARSERS, default='text',
+                        help="Station parser: plain page text or PDF layout (multi-column pages)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-extract every page instead of reusing cached results")
+    parser.add_argument('--output', default="fuel_stations_bulk.json",
+                        help="Merged output JSON file")
+    parser.add_argument('--dedupe', action='store_true',
+                        help="Merge stations repeated across files and write a conflict report")
+    args = parser.parse_args()
+
+    pdf_paths = find_pdfs(args.inputs)
+    if not pdf_paths:
+        print("Error: no PDF files matched")
+        sys.exit(1)
+
+    print(f"📚 Extracting {len(pdf_paths)} fuel books...")
+    data, entries = bulk_extract(pdf_paths, args.workers, args.parser, not args.no_cache)
+
+    output_file = Path(args.output)
+    if args.dedupe:
+        data, dedupe_report = dedupe_stations(data)
+        write_report(dedupe_report, report_path(output_file))
+    manifest_file = output_file.with_name(f"{output_file.stem}.manifest.json")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump({'output': str(output_file), 'files': entries}, f, indent=2, ensure_ascii=False)
+
+    counts = {}
+    for entry in entries:
+        counts[entry['status']] = counts.get(entry['status'], 0) + 1
+    print(f"\n✅ Bulk extraction complete!")
+    print(f"📄 Data saved to: {output_file}")
+    print(f"📋 Manifest saved to: {manifest_file}")
+    if args.dedupe:
+        print_summary(dedupe_report, report_path(output_file))
+    print(f"   Extracted: {counts.get('ok', 0)}, duplicates: {counts.get('duplicate', 0)}, "
+          f"errors: {counts.get('error', 0)}")
+    for entry in entries:
+        if entry['status'] == 'error':
+            print(f"   ❌ {entry['path']}: {entry['error']}")
+    print(f"   Total Fuel Stations: {sum(len(info['fuel_stations']) for info in data.values())}")
+
+
+if __name__ == "__main__":
+    main()
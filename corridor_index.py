@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Corridor queries: stations along a highway, ordered by exit.
+Parses free-text exit_info such as "I-20/I-59, Exit 77" or
+"I-80, Exit 151(W)/149(E)" into (highway, exit_number, direction) tuples
+and keeps one exit-sorted array per highway, so "I-85 between exits 10
+and 120" is two bisects instead of a scan over every station.
+"""
+
+import argparse
+import json
+import re
+import sys
+from bisect import bisect_left, bisect_right
+
+from station_table import StationTable
+
+# One token per match: a highway, an exit / mile marker, or an alternate
+# exit number following an exit ("Exit 45/45A", "Exit 3(N), 3B(S)").
+# "1-90" is a common typo for I-90 in the source data.
+EXIT_TOKEN_PATTERN = re.compile(
+    r'\b(?P<prefix>I|1(?=-)|US|U\.S\.|SR|Hwy\.?)\s*-?\s*(?P<route>[0-9]{1,3})\b(?:\s+(?P<bound>[NSEW])\b)?'
+    r'|\b(?P<turnpike>Tpike|Turnpike)\b'
+    r'|\b(?:Exit\s+|MM\s*)(?P<exit>[0-9]+[A-Z]?)(?:\s*\((?P<exit_dir>[NSEW])\))?'
+    r'|[/,]\s*(?P<alt>[0-9]+[A-Z]?)(?:\s*\((?P<alt_dir>[NSEW])\))?(?=\s*(?:[/,]|$))'
+)
+
+# Highway typed in a query, e.g. "I-85", "i85", "US 441"
+QUERY_HIGHWAY_PATTERN = re.compile(
+    r'(?P<prefix>I|US|U\.S\.|SR|Hwy\.?)\s*-?\s*(?P<route>[0-9]{1,3})$|(?P<turnpike>Tpike|Turnpike)$',
+    re.IGNORECASE
+)
+
+HIGHWAY_PREFIXES = {'I': 'I', '1': 'I', 'US': 'US', 'U.S.': 'US', 'SR': 'SR', 'HWY': 'HWY', 'HWY.': 'HWY'}
+
+EXIT_NUMBER_PATTERN = re.compile(r'[0-9]+')
+
+
+def normalize_highway(prefix, route):
+    """Canonical highway name, e.g. ('U.S.', '75') -> 'US-75'."""
+    return f"{HIGHWAY_PREFIXES[prefix.upper()]}-{int(route)}"
+
+
+def parse_highway(text):
+    """Canonical name of a highway typed by a user, or None."""
+    match = QUERY_HIGHWAY_PATTERN.match(text.strip())
+    if not match:
+        return None
+    if match.group('turnpike'):
+        return 'TPIKE'
+    return normalize_highway(match.group('prefix'), match.group('route'))
+
+
+def _exit_entry(label, direction):
+    """(exit_number, label, direction); "45A" sorts as exit 45."""
+    return int(EXIT_NUMBER_PATTERN.match(label).group()), label, direction
+
+
+def parse_exit_info(exit_info):
+    """Parse an exit_info string into [(highway, exit_number, exit_label, direction)].
+
+    Every exit applies to the highways listed since the previous exit;
+    highways with no numeric exit are returned with exit_number None.
+    """
+    if not exit_info:
+        return []
+    results = []
+    highways = []  # highways waiting for their exit, with any "I-81 N" bound
+    exits = []
+    after_exit = False
+
+    def flush():
+        for highway, bound in highways:
+            if not exits:
+                results.append((highway, None, None, bound))
+            for number, label, direction in exits:
+                results.append((highway, number, label, direction or bound))
+
+    for token in EXIT_TOKEN_PATTERN.finditer(exit_info):
+        if token.group('exit'):
+            exits.append(_exit_entry(token.group('exit'), token.group('exit_dir')))
+            after_exit = True
+        elif token.group('alt'):
+            if after_exit:
+                exits.append(_exit_entry(token.group('alt'), token.group('alt_dir')))
+        else:
+            if after_exit:
+                # A highway after an exit starts a new group:
+                # "I-77, Exit 41/I-81, Exit 72"
+                flush()
+                highways, exits, after_exit = [], [], False
+            if token.group('turnpike'):
+                highways.append(('TPIKE', None))
+            else:
+                highways.append((normalize_highway(token.group('prefix'), token.group('route')),
+                                 token.group('bound')))
+    flush()
+    return results
+
+
+class CorridorIndex:
+    """Per-highway exit-sorted arrays of stations."""
+
+    def __init__(self, stations):
+        entries = {}  # highway -> [(exit_number, label, direction, station)]
+        self.unnumbered = {}  # highway -> [station] with no numeric exit
+        for station in stations:
+            for highway, number, label, direction in parse_exit_info(station.get('exit_info')):
+                if number is None:
+                    self.unnumbered.setdefault(highway, []).append(station)
+                else:
+                    entries.setdefault(highway, []).append((number, label, direction, station))
+
+        # Parallel arrays per highway: exit numbers (bisect keys) and entries
+        self.exits = {}
+        self.entries = {}
+        for highway, highway_entries in entries.items():
+            highway_entries.sort(key=lambda entry: (entry[0], entry[1]))
+            self.exits[highway] = [entry[0] for entry in highway_entries]
+            self.entries[highway] = highway_entries
+
+    @classmethod
+    def from_data(cls, data):
+        """Index a BackendData dict or StationTable."""
+        if isinstance(data, StationTable):
+            return cls(station for _, station in data.iter_stations())
+        return cls(station for info in data.values() for station in info['fuel_stations'])
+
+    def highways(self):
+        return sorted(set(self.exits) | set(self.unnumbered))
+
+    def between(self, highway, start=None, end=None, direction=None):
+        """Stations on highway with exits from start to end, in travel order.
+
+        Returns [(exit_label, station)]. A start past end returns them in
+        descending exit order. direction keeps exits marked for that
+        direction or for none. A station listed under several exits of the
+        same highway is returned once, at its first exit.
+        """
+        highway = parse_highway(highway) or highway
+        keys = self.exits.get(highway, [])
+        entries = self.entries.get(highway, [])
+        descending = start is not None and end is not None and start > end
+        low, high = (end, start) if descending else (start, end)
+        first = bisect_left(keys, low) if low is not None else 0
+        last = bisect_right(keys, high) if high is not None else len(keys)
+        selected = entries[first:last]
+        if descending:
+            selected = reversed(selected)
+
+        results = []
+        seen = set()
+        for number, label, exit_direction, station in selected:
+            if direction and exit_direction and exit_direction != direction:
+                continue
+            if id(station) in seen:
+                continue
+            seen.add(id(station))
+            results.append((label, station))
+        return results
+
+
+def main():
+    """List stations along a highway between two exits."""
+    parser = argparse.ArgumentParser(description="Fuel stations along a highway corridor")
+    parser.add_argument('data', help="Extracted station JSON, e.g. fuel_stations_data.json")
+    parser.add_argument('highway', nargs='?', help="Highway, e.g. I-85")
+    parser.add_argument('--from', dest='start', type=int, help="First exit")
+    parser.add_argument('--to', dest='end', type=int, help="Last exit")
+    parser.add_argument('--direction', choices=['N', 'S', 'E', 'W'],
+                        help="Skip exits marked for the other direction")
+    args = parser.parse_args()
+
+    with open(args.data, 'r', encoding='utf-8') as f:
+        index = CorridorIndex.from_data(json.load(f))
+
+    if not args.highway:
+        for highway in index.highways():
+            print(f"  {highway}: {len(index.exits.get(highway, []))} exits")
+        return
+
+    highway = parse_highway(args.highway)
+    if highway is None:
+        print(f"Error: not a highway: {args.highway}")
+        sys.exit(1)
+    results = index.between(highway, args.start, args.end, args.direction)
+    print(f"🛣️  {len(results)} stations on {highway}")
+    for label, station in results:
+        print(f"  Exit {label:>5}  {station['name']}  ({station.get('city_state_zip', '')})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Duplicate and conflict detection for extracted stations.
+A station repeated on a continuation page, listed under two states or
+carried through several fuel book revisions is the same site: same
+NaviGo ID, or same number and brand. DedupeIndex keeps one hash index per
+key, so each station is matched in O(1) and a whole dataset in O(n).
+Duplicates are merged into the first occurrence (missing fields are
+filled in), and everything that does not add up is reported: fields with
+two different values, and NaviGo IDs shared by different stations.
+
+Usage: python dedupe.py fuel_stations_data.json [--output deduped.json] [--report report.json]
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from station_table import StationTable, iter_regions
+
+# Fields that say where a record was found rather than what it is
+LOCATION_FIELDS = ('page', 'state', 'source')
+
+REPORT_VERSION = 1
+
+
+def station_keys(station):
+    """(NaviGo key, (number, brand) key) of a station; None where a key is missing."""
+    navigo = (station.get('navigo_id') or '').strip().upper() or None
+    number = station.get('number')
+    number_key = (number, (station.get('type') or '').upper()) if number else None
+    return navigo, number_key
+
+
+def occurrence(region, station):
+    """Where a record was found, for the report."""
+    found = {'region': region}
+    for field in LOCATION_FIELDS:
+        if field in station:
+            found[field] = station[field]
+    return found
+
+
+class DedupeIndex:
+    """Stations kept so far, indexed by NaviGo ID and by (number, brand)."""
+
+    def __init__(self):
+        self.kept = []  # [(region, station)] in first-seen order
+        self.by_navigo = {}
+        self.by_number = {}
+        self.duplicates = []
+        self.conflicts = []
+        self.seen = 0
+
+    def add(self, region, station):
+        """Keep station, or merge it into the station it duplicates."""
+        self.seen += 1
+        navigo, number_key = station_keys(station)
+        navigo_match = self.by_navigo.get(navigo) if navigo else None
+        number_match = self.by_number.get(number_key) if number_key else None
+        match = number_match if number_match is not None else navigo_match
+
+        if match is not None:
+            conflict = self._identity_conflict(match, navigo_match, number_match, navigo, number_key)
+            if conflict is None:
+                self._merge(match, region, station)
+                return
+            self.conflicts.append({
+                'type': conflict,
+                'navigo_id': navigo,
+                'number': station.get('number'),
+                'brand': station.get('type'),
+                'occurrences': [occurrence(*self.kept[match]), occurrence(region, station)],
+            })
+
+        self._keep(region, dict(station))
+
+    def _identity_conflict(self, match, navigo_match, number_match, navigo, number_key):
+        """Why a key match is not the same station, or None if it is."""
+        if navigo_match is not None and number_match is not None and navigo_match != number_match:
+            return 'ambiguous_match'  # NaviGo ID and number point at different stations
+        kept_navigo, kept_number_key = station_keys(self.kept[match][1])
+        if navigo and kept_navigo and navigo != kept_navigo:
+            return 'navigo_mismatch'  # same number and brand, different NaviGo ID
+        if number_key and kept_number_key and number_key != kept_number_key:
+            return 'navigo_collision'  # same NaviGo ID, different station
+        return None
+
+    def _keep(self, region, station):
+        index = len(self.kept)
+        self.kept.append((region, station))
+        self._index(index, station)
+
+    def _index(self, index, station):
+        navigo, number_key = station_keys(station)
+        if navigo:
+            self.by_navigo.setdefault(navigo, index)
+        if number_key:
+            self.by_number.setdefault(number_key, index)
+
+    def _merge(self, index, region, station):
+        kept_region, kept = self.kept[index]
+        merged_fields = []
+        for field, value in station.items():
+            if field in LOCATION_FIELDS or value in (None, ''):
+                continue
+            current = kept.get(field)
+            if current in (None, ''):
+                kept[field] = value
+                merged_fields.append(field)
+            elif current != value:
+                self.conflicts.append({
+                    'type': 'field_conflict',
+                    'navigo_id': station_keys(kept)[0],
+                    'number': kept.get('number'),
+                    'brand': kept.get('type'),
+                    'field': field,
+                    'values': [current, value],
+                    'occurrences': [occurrence(kept_region, kept), occurrence(region, station)],
+                })
+        if merged_fields:
+            # Filled-in keys can match later duplicates too
+            self._index(index, kept)
+        self.duplicates.append({
+            'name': kept.get('name'),
+            'navigo_id': station_keys(kept)[0],
+            'kept': occurrence(kept_region, kept),
+            'dropped': occurrence(region, station),
+            'merged_fields': merged_fields,
+        })
+
+    def report(self):
+        return {
+            'version': REPORT_VERSION,
+            'stations_in': self.seen,
+            'stations_out': len(self.kept),
+            'duplicates': self.duplicates,
+            'conflicts': self.conflicts,
+        }
+
+
+def dedupe_stations(data):
+    """Deduplicated copy of extracted data (a dict or a StationTable), plus the report.
+
+    Regions and terminals are kept as they are; each station stays in the
+    region it was first seen in.
+    """
+    index = DedupeIndex()
+    terminals = {}
+    for region, info in iter_regions(data):
+        terminals[region] = info['terminals']
+        for station in info['fuel_stations']:
+            index.add(region, station)
+
+    if isinstance(data, StationTable):
+        deduped = StationTable()
+        for region, region_terminals in terminals.items():
+            deduped.add_region(region)
+            deduped.terminals[region] = region_terminals
+        for region, station in index.kept:
+            deduped.append(region, station)
+        return deduped, index.report()
+
+    deduped = {region: {'terminals': region_terminals, 'fuel_stations': []}
+               for region, region_terminals in terminals.items()}
+    for region, station in index.kept:
+        deduped[region]['fuel_stations'].append(station)
+    return deduped, index.report()
+
+
+def report_path(output_file):
+    """Report file written next to an output JSON: data.json -> data.dedupe.json."""
+    output_file = Path(output_file)
+    return output_file.with_name(f"{output_file.stem}.dedupe.json")
+
+
+def write_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def print_summary(report, path):
+    print(f"🧹 Removed {report['stations_in'] - report['stations_out']} duplicate stations, "
+          f"{len(report['conflicts'])} conflicts (details in {path})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove duplicate stations and report conflicts")
+    parser.add_argument('data', help="Extracted station JSON")
+    parser.add_argument('--output', help="Deduplicated JSON (default: overwrite data)")
+    parser.add_argument('--report', help="Report JSON (default: <output>.dedupe.json)")
+    args = parser.parse_args()
+
+    with open(args.data, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    deduped, report = dedupe_stations(data)
+
+    output_file = args.output or args.data
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(deduped, f, indent=2, ensure_ascii=False)
+    report_file = args.report or report_path(output_file)
+    write_report(report, report_file)
+
+    print(f"📄 Data saved to: {output_file}")
+    print_summary(report, report_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,203 @@ This is more reliable than PDF extraction since the HTML structure is consistent
 """
 
 import re
-import json
-from bs4 import BeautifulSoup
 
-def extract_fuel_data_from_html(html_file):
-    """Parse fuel station data from HTML review file."""
+from station_patterns import STATION_MATCHER, is_city_state_zip, terminal_fields
+from station_table import StationTable, dump_json, region_counts
+
+try:
+    from lxml import etree
+except ImportError:  # fall back to BeautifulSoup's pure-Python parser
+    etree = None
+
+STATION_NUMBER_PATTERN = re.compile(r'#(\d{3})')
+HEADER_EMOJI_PATTERN = re.compile(r'^[📍❌🇨🇦]\s*')
+COVENANT_HEADING_PATTERN = re.compile(r'COVENANT.*TERMINALS', re.I)
+
+def clean_state_name(header_text):
+    """Remove the leading emoji from a state header."""
+    return HEADER_EMOJI_PATTERN.sub('', header_text.strip())
+
+def build_station(name, brand, site_type, detail_texts):
+    """Build a station dict from the text of one station card.
+
+    Returns None when the card lacks a name or a location.
+    """
+    station = {}
+    
+    # Extract station name
+    if name is not None:
+        station['name'] = name
+        # Extract number from name (#123)
+        number_match = STATION_NUMBER_PATTERN.search(name)
+        if number_match:
+            station['number'] = number_match.group(1)
+    
+    # Extract brand (TA or Petro)
+    if brand is not None:
+        station['type'] = brand
+    
+    # Extract site type
+    if site_type is not None:
+        station['site_type'] = site_type
+    
+    # Extract details
+    if detail_texts is not None:
+        fields = STATION_MATCHER.scan_labels(detail_texts)
+        for field, value in fields.items():
+            if field in ('address', 'phone', 'fax', 'navigo_id'):
+                station[field] = value
+        
+        # Location is usually CITY, ST ZIP; Exit might be City, ST ZIP OR just exit numbers
+        location_text = fields.get('location')
+        exit_text = fields.get('exit')
+        
+        # Smart detection: Which field has "City, ST ZIP" format?
+        if location_text and is_city_state_zip(location_text):
+            # Location has city/state/zip format
+            station['city_state_zip'] = location_text
+            if exit_text:
+                station['exit_info'] = exit_text
+        elif exit_text and is_city_state_zip(exit_text):
+            # Exit has city/state/zip format
+            station['city_state_zip'] = exit_text
+            if location_text:
+                # Location is probably the street address in this case
+                if not station.get('address'):
+                    station['address'] = location_text
+        else:
+            # Fallback: use whatever we have
+            station['city_state_zip'] = location_text or exit_text or ''
+    
+    # Only add if we have essential data
+    if 'name' in station and 'city_state_zip' in station:
+        return station
+    return None
+
+def build_terminal(name, detail_texts):
+    """Build a Covenant terminal dict from the text of one terminal card."""
+    terminal = {'type': 'Covenant Terminal'}
+    
+    if name is not None:
+        terminal['name'] = name
+    
+    for field, value in terminal_fields(lines=detail_texts or []).items():
+        terminal.setdefault(field, value)
+    
+    return terminal if 'name' in terminal else None
+
+def extract_fuel_data_from_html(html_file, as_table=False):
+    """Parse fuel station data from HTML review file.
+
+    Streams the file with lxml when it is installed, otherwise builds a
+    full BeautifulSoup tree. as_table returns the StationTable instead of
+    the {state: {terminals, fuel_stations}} dict.
+    """
+    if etree is not None:
+        table = extract_fuel_data_from_html_lxml(html_file)
+    else:
+        table = extract_fuel_data_from_html_bs4(html_file)
+    return table if as_table else table.to_dict()
+
+def _has_class(element, class_name):
+    return class_name in (element.get('class') or '').split()
+
+def _first_div(element, class_name):
+    for div in element.iter('div'):
+        if div is not element and _has_class(div, class_name):
+            return div
+    return None
+
+def _element_text(element):
+    return ''.join(element.itertext())
+
+def _release(element):
+    """Free a processed element and the siblings parsed before it."""
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+def extract_fuel_data_from_html_lxml(html_file):
+    """Streaming parser: handles one card at a time and drops it afterwards."""
+    table = StationTable()
+    current_state = None
+    in_covenant = False
+    
+    for event, element in etree.iterparse(html_file, events=('end',), html=True,
+                                          encoding='utf-8', tag=('div', 'h2')):
+        if element.tag == 'h2':
+            if COVENANT_HEADING_PATTERN.search(element.text or ''):
+                table.add_region('COVENANT_TERMINALS')
+                in_covenant = True
+            continue
+        
+        classes = (element.get('class') or '').split()
+        if 'state-header' in classes:
+            state_span = element.find('span')
+            if state_span is None:
+                current_state = None
+                continue
+            state_name = clean_state_name(_element_text(state_span))
+            # Skip covenant terminals section (handled separately)
+            if 'COVENANT' in state_name.upper():
+                current_state = None
+                continue
+            current_state = state_name
+            table.add_region(current_state)
+        
+        elif 'station-card' in classes:
+            if current_state is not None:
+                station = _station_from_element(element)
+                if station:
+                    table.append(current_state, station)
+            _release(element)
+        
+        elif 'state-section' in classes:
+            current_state = None
+            _release(element)
+        
+        elif 'terminal-card' in classes and in_covenant:
+            name_div = _first_div(element, 'terminal-name')
+            details_div = _first_div(element, 'terminal-details')
+            terminal = build_terminal(
+                _element_text(name_div).strip() if name_div is not None else None,
+                [_element_text(div).strip() for div in details_div.iter('div')
+                 if div is not details_div] if details_div is not None else None
+            )
+            if terminal:
+                table.add_terminal('COVENANT_TERMINALS', terminal)
+            _release(element)
+        
+        elif 'covenant-section' in classes:
+            in_covenant = False
+    
+    return table
+
+def _station_from_element(card):
+    name_div = _first_div(card, 'station-name')
+    brand_div = _first_div(card, 'brand-badge')
+    site_type_div = _first_div(card, 'site-type')
+    details_div = _first_div(card, 'station-details')
+    return build_station(
+        _element_text(name_div).strip() if name_div is not None else None,
+        _element_text(brand_div).strip() if brand_div is not None else None,
+        _element_text(site_type_div).strip() if site_type_div is not None else None,
+        [_element_text(div).strip() for div in details_div.iter('div')
+         if div is not details_div] if details_div is not None else None
+    )
+
+def extract_fuel_data_from_html_bs4(html_file):
+    """Tree-based parser using BeautifulSoup (no lxml needed)."""
+    from bs4 import BeautifulSoup
     
     with open(html_file, 'r', encoding='utf-8') as f:
         html_content = f.read()
     
     soup = BeautifulSoup(html_content, 'html.parser')
     
-    data = {}
+    table = StationTable()
     current_state = None
     
     # Find all state sections
@@ -32,150 +217,63 @@ def extract_fuel_data_from_html(html_file):
         if not state_span:
             continue
             
-        state_name = state_span.text.strip()
-        # Remove emoji and clean up
-        state_name = re.sub(r'^[📍❌🇨🇦]\s*', '', state_name)
+        state_name = clean_state_name(state_span.text)
         
         # Skip covenant terminals section (we'll handle separately)
         if 'COVENANT' in state_name.upper():
             continue
             
         current_state = state_name
-        data[current_state] = {
-            'fuel_stations': [],
-            'terminals': []
-        }
+        table.add_region(current_state)
             
         # Find all station cards in this section
         station_cards = section.find_all('div', class_='station-card')
         
         for card in station_cards:
-            station = {}
-            
-            # Extract station name
             name_div = card.find('div', class_='station-name')
-            if name_div:
-                station['name'] = name_div.text.strip()
-                # Extract number from name (#123)
-                number_match = re.search(r'#(\d{3})', station['name'])
-                if number_match:
-                    station['number'] = number_match.group(1)
-            
-            # Extract brand (TA or Petro)
             brand_div = card.find('div', class_='brand-badge')
-            if brand_div:
-                station['type'] = brand_div.text.strip()
-            
-            # Extract site type
             site_type_div = card.find('div', class_='site-type')
-            if site_type_div:
-                station['site_type'] = site_type_div.text.strip()
-            
-            # Extract details
             details_div = card.find('div', class_='station-details')
-            if details_div:
-                detail_divs = details_div.find_all('div')
-                
-                # Track what we find
-                location_text = None
-                exit_text = None
-                
-                for div in detail_divs:
-                    text = div.text.strip()
-                    
-                    if text.startswith('Address:'):
-                        # Street address or city name
-                        station['address'] = text.replace('Address:', '').strip()
-                    
-                    elif text.startswith('Location:'):
-                        # This is CITY, ST ZIP format - use this!
-                        location_text = text.replace('Location:', '').strip()
-                    
-                    elif text.startswith('Exit:'):
-                        # Exit info - might be City, ST ZIP OR just exit numbers
-                        exit_text = text.replace('Exit:', '').strip()
-                    
-                    elif text.startswith('Phone:'):
-                        station['phone'] = text.replace('Phone:', '').strip()
-                    
-                    elif text.startswith('Fax:'):
-                        station['fax'] = text.replace('Fax:', '').strip()
-                    
-                    elif text.startswith('NaviGo ID:'):
-                        station['navigo_id'] = text.replace('NaviGo ID:', '').strip()
-                
-                # Smart detection: Which field has "City, ST ZIP" format?
-                # Look for pattern: comma + 2-letter state + 5-digit ZIP
-                city_state_zip_pattern = r',\s*[A-Z]{2}\s+\d{5}'
-                
-                if location_text and re.search(city_state_zip_pattern, location_text):
-                    # Location has city/state/zip format
-                    station['city_state_zip'] = location_text
-                    if exit_text:
-                        station['exit_info'] = exit_text
-                elif exit_text and re.search(city_state_zip_pattern, exit_text):
-                    # Exit has city/state/zip format
-                    station['city_state_zip'] = exit_text
-                    if location_text:
-                        # Location is probably the street address in this case
-                        if not station.get('address'):
-                            station['address'] = location_text
-                else:
-                    # Fallback: use whatever we have
-                    station['city_state_zip'] = location_text or exit_text or ''
-            
-            # Only add if we have essential data
-            if 'name' in station and 'city_state_zip' in station:
-                data[current_state]['fuel_stations'].append(station)
+            station = build_station(
+                name_div.text.strip() if name_div else None,
+                brand_div.text.strip() if brand_div else None,
+                site_type_div.text.strip() if site_type_div else None,
+                [div.text.strip() for div in details_div.find_all('div')] if details_div else None
+            )
+            if station:
+                table.append(current_state, station)
     
     # Handle Covenant Terminals
-    covenant_section = soup.find('h2', string=re.compile(r'COVENANT.*TERMINALS', re.I))
+    covenant_section = soup.find('h2', string=COVENANT_HEADING_PATTERN)
     if covenant_section:
-        data['COVENANT_TERMINALS'] = {
-            'terminals': [],
-            'fuel_stations': []
-        }
+        table.add_region('COVENANT_TERMINALS')
         
         section = covenant_section.find_next_sibling('div', class_='covenant-section')
         if section:
             terminal_cards = section.find_all('div', class_='terminal-card')
             
             for card in terminal_cards:
-                terminal = {'type': 'Covenant Terminal'}
-                
                 name_div = card.find('div', class_='terminal-name')
-                if name_div:
-                    terminal['name'] = name_div.text.strip()
-                
                 details_div = card.find('div', class_='terminal-details')
-                if details_div:
-                    detail_divs = details_div.find_all('div')
-                    
-                    for div in detail_divs:
-                        text = div.text.strip()
-                        
-                        if text.startswith('Address:'):
-                            terminal['address'] = text.replace('Address:', '').strip()
-                        elif text.startswith('Phone:'):
-                            terminal['phone'] = text.replace('Phone:', '').strip()
-                        elif text.startswith('NaviGo ID:'):
-                            terminal['navigo_id'] = text.replace('NaviGo ID:', '').strip()
-                
-                if 'name' in terminal:
-                    data['COVENANT_TERMINALS']['terminals'].append(terminal)
-    
-    return data
+                terminal = build_terminal(
+                    name_div.text.strip() if name_div else None,
+                    [div.text.strip() for div in details_div.find_all('div')] if details_div else None
+                )
+                if terminal:
+                    table.add_terminal('COVENANT_TERMINALS', terminal)
+    
+    return table
 
 if __name__ == '__main__':
     print("📖 Extracting fuel station data from HTML...")
     
     html_file = 'fuel_stations_review.html'
-    data = extract_fuel_data_from_html(html_file)
+    data = extract_fuel_data_from_html(html_file, as_table=True)
     
     # Save to JSON
     output_file = 'fuel_stations_data.json'
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        dump_json(data, f)
     
     print(f"\n✅ Extraction complete!")
     print(f"📄 Data saved to: {output_file}")
@@ -183,12 +281,10 @@ if __name__ == '__main__':
     # Print summary
     print(f"\n📊 Summary:")
     total_stations = 0
-    for state, info in data.items():
+    for state, terminal_count, station_count in region_counts(data):
         if state == 'COVENANT_TERMINALS':
-            terminal_count = len(info['terminals'])
             print(f"  Covenant Terminals: {terminal_count}")
         else:
-            station_count = len(info['fuel_stations'])
             total_stations += station_count
             print(f"  {state}: {station_count} stations")
     
@@ -4,11 +4,24 @@ Extract fuel station data from Covenant Fuel Book PDF
 Organizes data by state with all station details
 """
 
-import fitz  # PyMuPDF
+import argparse
 import json
 import re
+from functools import partial
 from pathlib import Path
 
+from dedupe import dedupe_stations, print_summary, report_path, write_report
+from extraction_cache import ExtractionCache, file_hash, cached_page_count, store_page_count
+from layout_parser import page_text_and_layout, parse_fuel_stations_layout
+from pdf_session import PDFSession, map_pages_parallel
+from normalize_stations import write_normalized
+from search_index import write_search_index
+from snapshot import write_snapshot
+from station_table import StationTable, dump_json, region_counts
+from station_patterns import (
+    STATION_PATTERN, CITY_STATE_ZIP_PATTERN, collect_fields, site_type, terminal_fields
+)
+
 # List of US states to identify
 STATES = [
     'ALABAMA', 'ALASKA', 'ARIZONA', 'ARKANSAS', 'CALIFORNIA', 'COLORADO',
@@ -23,122 +36,209 @@ STATES = [
     'WEST VIRGINIA', 'WISCONSIN', 'WYOMING'
 ]
 
-def extract_fuel_stations(pdf_path):
-    """Extract all fuel station data from PDF."""
-    doc = fitz.open(pdf_path)
+# Canadian provinces and territories (plus the combined CANADA section)
+PROVINCES = [
+    'ALBERTA', 'BRITISH COLUMBIA', 'MANITOBA', 'NEW BRUNSWICK',
+    'NEWFOUNDLAND AND LABRADOR', 'NORTHWEST TERRITORIES', 'NOVA SCOTIA',
+    'NUNAVUT', 'ONTARIO', 'PRINCE EDWARD ISLAND', 'QUEBEC', 'SASKATCHEWAN',
+    'YUKON', 'CANADA'
+]
+
+# All region headers in one alternation: whole words only, longest name
+# first, so 'KANSAS' never matches inside 'ARKANSAS' and 'WEST VIRGINIA'
+# wins over 'VIRGINIA'. Words may be split across lines in the PDF text.
+STATE_HEADER_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(
+        r'\s+'.join(map(re.escape, name.split()))
+        for name in sorted(STATES + PROVINCES, key=len, reverse=True)
+    ) + r')\b'
+)
+
+# Page kinds assigned by classify_page
+PAGE_TERMINAL = 'terminal'  # a Covenant Logistics terminal
+PAGE_STATE = 'state'  # starts a state/province section (header + legend)
+PAGE_KEY = 'key'  # site type key/legend without a region header
+PAGE_STATIONS = 'stations'  # station entries continuing the current section
+PAGE_OTHER = 'other'  # cover, intro and anything else
+
+# A terminal page names the terminal. With station entries on the page it
+# must also list one of these uppercase fields (station pages use
+# "NaviGo:", not "NAVIGO ID:"); without them the name alone is enough
+TERMINAL_FIELDS = ('NAVIGO ID:', 'AMENITIES:', 'SHOWERS:', 'PARKING SPOTS:')
+
+# Bump when scan_page output changes so cached page results are invalidated
+PARSER_VERSION = 9
+
+# Station parsers: 'text' reads plain page text, 'layout' groups station
+# cards by their position on the page (see layout_parser.py)
+PARSERS = ('text', 'layout')
+
+def scan_method(parser='text'):
+    """Cache key for per-page scan results of a parser."""
+    return f"scan_page/{parser}/v{PARSER_VERSION}"
+
+SCAN_METHOD = scan_method()
+
+def extract_fuel_stations(pdf_path, workers=1, cache=None, parser='text', as_table=False):
+    """Extract all fuel station data from PDF.
+
+    Accepts a path or an already-open PDFSession, so callers that have
+    parsed the document (e.g. PDFExtractor.extract_all) can reuse its pages.
+    With a path, workers > 1 (or 0 for all cores) scans pages in a process
+    pool; results are merged back in page order. With an ExtractionCache,
+    per-page results of a byte-identical PDF are reused instead of re-scanned.
+    as_table returns a StationTable instead of the nested dict.
+    """
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser: {parser} (choose from {', '.join(PARSERS)})")
+    if cache is None:
+        return merge_page_results(iter_pages(pdf_path, workers, parser), as_table)
     
-    # Data structure: {state: {terminals: [], fuel_stations: []}}
-    data = {}
-    current_state = None
+    source = pdf_path.pdf_path if isinstance(pdf_path, PDFSession) else pdf_path
+    pdf_hash = file_hash(source)
+    page_cache = cache.bind(pdf_hash, scan_method(parser))
+    page_count = cached_page_count(cache, pdf_hash)
+    page_results = page_cache.get_pages()
+    if page_count is None or len(page_results) != page_count:
+        page_results = {result['page']: result for result in scan_pages(pdf_path, workers, parser)}
+        page_count = len(page_results)
+        store_page_count(cache, pdf_hash, page_count)
+        page_cache.put_pages(page_results)
+    
+    # Pop each page as it is merged so its station dicts are freed early
+    return merge_page_results((page_results.pop(page_num) for page_num in range(1, page_count + 1)),
+                              as_table)
+
+def scan_pages(pdf_path, workers=1, parser='text'):
+    """Run scan_page over every page of a path or open PDFSession."""
+    return list(iter_pages(pdf_path, workers, parser))
+
+def iter_pages(pdf_path, workers=1, parser='text'):
+    """scan_pages as a generator; in one process each page is scanned on demand."""
+    if isinstance(pdf_path, PDFSession):
+        yield from _scan_session(pdf_path, 0, pdf_path.page_count, parser)
+    elif workers != 1:
+        yield from map_pages_parallel(partial(_scan_page_chunk, parser=parser), pdf_path, workers)
+    else:
+        with PDFSession(pdf_path) as session:
+            yield from _scan_session(session, 0, session.page_count, parser)
+
+def _scan_page_chunk(pdf_path, start, stop, parser='text'):
+    """Process-pool worker: scan pages [start, stop) with a private handle."""
+    with PDFSession(pdf_path) as session:
+        return list(_scan_session(session, start, stop, parser))
+
+def _scan_session(session, start, stop, parser):
+    for page_num in range(start, stop):
+        yield scan_session_page(session, page_num, parser)
+
+def scan_session_page(session, page_index, parser='text'):
+    """scan_page for the page at a 0-based index of an open PDFSession."""
+    if parser != 'layout':
+        return scan_page(session.page_text(page_index), page_index + 1)
+    page = session.page(page_index)
+    text, textpage = page_text_and_layout(page)
+    return scan_page(text, page_index + 1, page, textpage)
+
+def classify_page(text):
+    """Return (page kind, state header or None) from cheap text checks."""
+    state = find_state_header(text)
+    if "Covenant Logistics:" in text and (any(field in text for field in TERMINAL_FIELDS)
+                                          or not has_station_entries(text)):
+        # A region header on a terminal page still starts that region
+        return PAGE_TERMINAL, state
+    if state:
+        return PAGE_STATE, state
+    # A legend page that also lists stations is a station page
+    if has_station_entries(text):
+        return PAGE_STATIONS, None
+    if "SITE TYPE KEY" in text:
+        return PAGE_KEY, None
+    return PAGE_OTHER, None
+
+def has_station_entries(text):
+    return "#" in text and STATION_PATTERN.search(text) is not None
+
+def scan_page(text, page_num, page=None, textpage=None):
+    """Classify one page and run the parser for its kind.
+
+    Stations are parsed without a state; merge_page_results assigns it,
+    since a state header carries over onto the following pages. Given the
+    PyMuPDF page, stations are parsed from its layout instead of raw text.
+    """
+    kind, state = classify_page(text)
+    result = {'page': page_num, 'kind': kind, 'terminal': None, 'state': state, 'stations': []}
+    
+    if kind == PAGE_TERMINAL:
+        result['terminal'] = parse_covenant_terminal(text, page_num)
+    # Stations sharing a page with a terminal still belong to the current state
+    if kind in (PAGE_STATE, PAGE_STATIONS) or (kind == PAGE_TERMINAL and has_station_entries(text)):
+        if page is not None:
+            result['stations'] = parse_fuel_stations_layout(page, None, page_num, textpage)
+        else:
+            result['stations'] = parse_fuel_stations(text, None, page_num)
     
-    # First, extract Covenant terminals (pages 10-20 approx)
+    return result
+
+def find_state_header(text):
+    """Return the state/province a page starts, or None.
+
+    Only pages carrying the "SITE TYPE KEY" legend start a region; the
+    first region name on such a page is its header.
+    """
+    if "SITE TYPE KEY" not in text:
+        return None
+    match = STATE_HEADER_PATTERN.search(text)
+    if not match:
+        return None
+    return ' '.join(match.group().split())
+
+def merge_page_results(page_results, as_table=False):
+    """Fold per-page scan results (in page order) into the state dict.
+
+    Stations are gathered in a compact StationTable; as_table returns it
+    as is instead of the {state: {terminals, fuel_stations}} dict.
+    """
+    table = StationTable()
+    current_state = None
     covenant_terminals = []
-    for page_num in range(9, 20):  # Pages 10-20
-        if page_num >= doc.page_count:
-            break
-        
-        text = doc[page_num].get_text()
-        if "Covenant Logistics:" in text:
-            terminal = parse_covenant_terminal(text, page_num + 1)
-            if terminal:
-                covenant_terminals.append(terminal)
     
-    # Extract state-by-state fuel stations (start from page 1 to catch all states)
-    for page_num in range(0, doc.page_count):
-        text = doc[page_num].get_text()
-        
-        # Check if this page has a state header
-        found_state = None
-        for state in STATES:
-            if state in text and "SITE TYPE KEY" in text:
-                found_state = state
-                break
+    for result in page_results:
+        if result['terminal']:
+            covenant_terminals.append(result['terminal'])
         
-        if found_state:
-            current_state = found_state
-            if current_state not in data:
-                data[current_state] = {
-                    'terminals': [],
-                    'fuel_stations': []
-                }
+        if result['state']:
+            current_state = result['state']
+            table.add_region(current_state)
         
-        # Extract fuel stations from this page
-        if current_state and "#" in text:  # Station entries have #number
-            stations = parse_fuel_stations(text, current_state, page_num + 1)
-            if stations:
-                data[current_state]['fuel_stations'].extend(stations)
+        if current_state and result['stations']:
+            for station in result['stations']:
+                station['state'] = current_state
+                table.append(current_state, station)
     
     # Add Covenant terminals to data
-    data['COVENANT_TERMINALS'] = {
-        'terminals': covenant_terminals,
-        'fuel_stations': []
-    }
+    table.add_region('COVENANT_TERMINALS')
+    for terminal in covenant_terminals:
+        table.add_terminal('COVENANT_TERMINALS', terminal)
     
-    doc.close()
-    return data
+    return table if as_table else table.to_dict()
 
 def parse_covenant_terminal(text, page_num):
     """Parse Covenant Logistics terminal information."""
-    lines = text.split('\n')
     terminal = {'page': page_num, 'type': 'Covenant Terminal'}
-    
-    # Extract name and location
-    for line in lines:
-        if "Covenant Logistics:" in line:
-            terminal['name'] = line.strip()
-            break
-    
-    # Extract address
-    address_pattern = r'([0-9]+\s+[^,]+,\s*[A-Z]{2}\s+[0-9]{5})'
-    address_match = re.search(address_pattern, text)
-    if address_match:
-        terminal['address'] = address_match.group(1)
-    
-    # Extract phone
-    phone_pattern = r'Phone:\s*(\([0-9]{3}\)\s*[0-9]{3}-[0-9]{4})'
-    phone_match = re.search(phone_pattern, text)
-    if phone_match:
-        terminal['phone'] = phone_match.group(1)
-    
-    # Extract NaviGo ID
-    navigo_pattern = r'NAVIGO ID:\s*([A-Z0-9-]+)'
-    navigo_match = re.search(navigo_pattern, text)
-    if navigo_match:
-        terminal['navigo_id'] = navigo_match.group(1)
-    
-    # Extract amenities
-    amenities = []
-    in_amenities = False
-    for line in lines:
-        if "AMENITIES:" in line:
-            in_amenities = True
-            continue
-        if in_amenities and line.strip().startswith('-'):
-            amenities.append(line.strip().replace('- ', ''))
-        elif in_amenities and not line.strip().startswith('-') and line.strip():
-            break
-    if amenities:
-        terminal['amenities'] = amenities
-    
-    # Extract basic info
-    if "SHOWERS:" in text:
-        terminal['showers'] = re.search(r'SHOWERS:\s*([A-Z0-9]+)', text).group(1) if re.search(r'SHOWERS:\s*([A-Z0-9]+)', text) else 'NO'
-    if "PARKING SPOTS:" in text:
-        terminal['parking'] = re.search(r'PARKING SPOTS:\s*([0-9]+)', text).group(1) if re.search(r'PARKING SPOTS:\s*([0-9]+)', text) else '0'
-    if "SHOP:" in text:
-        terminal['shop'] = re.search(r'SHOP:\s*([A-Z]+)', text).group(1) if re.search(r'SHOP:\s*([A-Z]+)', text) else 'NO'
-    
+    terminal.update(terminal_fields(text))
     return terminal if 'name' in terminal else None
 
 def parse_fuel_stations(text, state, page_num):
-    """Parse fuel station entries from a page."""
+    """Parse fuel station entries from a page.
+
+    One scan finds the station headers, which split the page into blocks;
+    each block is then scanned once, in place, for all of its fields.
+    """
+    matches = list(STATION_PATTERN.finditer(text))
     stations = []
     
-    # Pattern to match station entries: #123 TA Location or #123 Petro Location
-    station_pattern = r'#([0-9]{3})\s+(TA|Petro)\s+([^\n]+)'
-    matches = re.finditer(station_pattern, text)
-    
-    for match in matches:
+    for i, match in enumerate(matches):
         station = {
             'page': page_num,
             'state': state,
@@ -147,20 +247,19 @@ def parse_fuel_stations(text, state, page_num):
             'name': f"#{match.group(1)} {match.group(2)} {match.group(3).strip()}"
         }
         
-        # Extract full details for this station
-        # Find the text block for this specific station
+        # The block runs up to the next station header
         start_pos = match.start()
-        # Find next station or end of relevant text
-        next_match = re.search(r'#[0-9]{3}\s+(TA|Petro)', text[start_pos + 20:])
-        end_pos = start_pos + next_match.start() + 20 if next_match else len(text)
-        station_block = text[start_pos:end_pos]
+        end_pos = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        
+        # First hit of each field (and site type marker) in the block
+        fields = collect_fields(text, {}, start_pos, end_pos)
         
         # Extract address and city/state/zip
         # Some stations have: Name → Address → City,ST ZIP
         # Others have: Name → City,ST ZIP → Address (swapped!)
-        lines = station_block.split('\n')
+        lines = text[start_pos:end_pos].split('\n', 4)
         
-        # Check which line has city/state/zip format (contains comma and state abbreviation)
+        # Check which line has city/state/zip format
         city_state_zip_line = None
         address_line = None
         
@@ -168,11 +267,10 @@ def parse_fuel_stations(text, state, page_num):
             line1 = lines[1].strip()
             line2 = lines[2].strip() if len(lines) > 2 else ''
             
-            # City/state/zip format: "City, ST ZIP" (has comma and 2-letter state)
-            if ',' in line1 and re.search(r',\s*[A-Z]{2}\s+[0-9]{5}', line1):
+            if CITY_STATE_ZIP_PATTERN.search(line1):
                 city_state_zip_line = line1
                 address_line = line2
-            elif ',' in line2 and re.search(r',\s*[A-Z]{2}\s+[0-9]{5}', line2):
+            elif CITY_STATE_ZIP_PATTERN.search(line2):
                 address_line = line1
                 city_state_zip_line = line2
             else:
@@ -188,62 +286,101 @@ def parse_fuel_stations(text, state, page_num):
         if len(lines) > 3:
             station['exit_info'] = lines[3].strip()
         
-        # Extract phone/fax
-        phone_match = re.search(r'Ph:\s*(\([0-9]{3}\)\s*[0-9]{3}-[0-9]{4})', station_block)
-        if phone_match:
-            station['phone'] = phone_match.group(1)
-        
-        fax_match = re.search(r'Fx:\s*(\([0-9]{3}\)\s*[0-9]{3}-[0-9]{4})', station_block)
-        if fax_match:
-            station['fax'] = fax_match.group(1)
-        
-        # Extract NaviGo ID
-        navigo_match = re.search(r'NaviGo:\s*([A-Z0-9-]+)', station_block)
-        if navigo_match:
-            station['navigo_id'] = navigo_match.group(1)
+        for field in ('phone', 'fax', 'navigo_id'):
+            if field in fields:
+                station[field] = fields[field]
         
         # Determine site type from symbols
-        if '★' in station_block:
-            station['site_type'] = 'Exclusive'
-        elif '●' in station_block:
-            # Check if it says "Primary" or "Limited" nearby
-            if 'Primary' in station_block:
-                station['site_type'] = 'Primary'
-            elif 'Limited' in station_block:
-                station['site_type'] = 'Limited'
-            else:
-                station['site_type'] = 'Primary'  # Default for ●
-        else:
-            station['site_type'] = 'Unknown'
+        station['site_type'] = site_type(fields)
         
         stations.append(station)
     
     return stations
 
 def main():
-    pdf_path = Path("pdfs/Fuel_Book_Covenant_Last_Revised_3-2023-2.pdf")
+    parser = argparse.ArgumentParser(description="Extract fuel station data from a fuel book PDF")
+    parser.add_argument('pdf', nargs='?',
+                        default="pdfs/Fuel_Book_Covenant_Last_Revised_3-2023-2.pdf",
+                        help="Path to the fuel book PDF")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes for page scanning (0 = all cores)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-extract every page instead of reusing cached results")
+    parser.add_argument('--parser', choices=PARSERS, default='text',
+                        help="Station parser: plain page text or PDF layout (multi-column pages)")
+    parser.add_argument('--output', default="fuel_stations_data.json",
+                        help="Output JSON file")
+    parser.add_argument('--snapshot',
+                        help="Also write a binary snapshot (see snapshot.py) to this path")
+    parser.add_argument('--search-index',
+                        help="Also write the prebuilt search index (see search_index.py) to this path")
+    parser.add_argument('--normalized',
+                        help="Also write frontend FuelStation records (see normalize_stations.py) to this path")
+    parser.add_argument('--dedupe', action='store_true',
+                        help="Merge duplicate stations and write a conflict report next to --output")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Re-parse only pages changed since the last run of --output")
+    args = parser.parse_args()
+    if args.incremental and (args.workers != 1 or args.no_cache):
+        parser.error("--incremental reuses the previous output page by page in one process; "
+                     "it cannot be combined with --workers or --no-cache")
+    pdf_path = Path(args.pdf)
+    output_file = Path(args.output)
     
     print("📖 Extracting fuel station data from PDF...")
-    data = extract_fuel_stations(pdf_path)
+    if args.incremental:
+        from incremental import extract_incremental, save_manifest
+        data, manifest, diff, reparsed = extract_incremental(pdf_path, output_file, args.parser)
+        save_manifest(manifest, output_file)
+        diff_file = output_file.with_name(f"{output_file.stem}.diff.json")
+        with open(diff_file, 'w', encoding='utf-8') as f:
+            json.dump(diff, f, indent=2, ensure_ascii=False)
+        print(f"🔁 Re-parsed {reparsed} of {len(manifest['pages'])} pages")
+        print(f"   Stations added: {len(diff['added'])}, removed: {len(diff['removed'])}, "
+              f"modified: {len(diff['modified'])} (details in {diff_file})")
+    elif args.no_cache:
+        data = extract_fuel_stations(pdf_path, workers=args.workers, parser=args.parser,
+                                     as_table=True)
+    else:
+        with ExtractionCache() as cache:
+            data = extract_fuel_stations(pdf_path, workers=args.workers, cache=cache,
+                                         parser=args.parser, as_table=True)
+    
+    if args.dedupe:
+        data, dedupe_report = dedupe_stations(data)
+        write_report(dedupe_report, report_path(output_file))
     
     # Save to JSON
-    output_file = Path("fuel_stations_data.json")
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        dump_json(data, f)
+    if args.snapshot:
+        write_snapshot(data, args.snapshot)
+    if args.search_index:
+        write_search_index(data, args.search_index)
+    if args.normalized:
+        write_normalized(data, args.normalized)
     
     # Print summary
     print(f"\n✅ Extraction complete!")
     print(f"📄 Data saved to: {output_file}")
+    if args.snapshot:
+        print(f"📦 Snapshot saved to: {args.snapshot}")
+    if args.search_index:
+        print(f"🔎 Search index saved to: {args.search_index}")
+    if args.normalized:
+        print(f"🧾 Normalized records saved to: {args.normalized}")
+    if args.dedupe:
+        print_summary(dedupe_report, report_path(output_file))
     print(f"\n📊 Summary:")
     
     total_stations = 0
-    for state, info in data.items():
+    for state, terminal_count, station_count in region_counts(data):
         if state == 'COVENANT_TERMINALS':
-            print(f"  Covenant Terminals: {len(info['terminals'])}")
+            print(f"  Covenant Terminals: {terminal_count}")
         else:
-            total_stations += len(info['fuel_stations'])
-            if info['fuel_stations']:
-                print(f"  {state}: {len(info['fuel_stations'])} stations")
+            total_stations += station_count
+            if station_count:
+                print(f"  {state}: {station_count} stations")
     
     print(f"\n  Total Fuel Stations: {total_stations}")
 
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Persistent extraction cache.
+Stores per-page extraction results in SQLite, keyed by the PDF's content
+hash, the page number and the extractor method, so re-running on a
+byte-identical fuel book skips the extraction work entirely.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path(os.environ.get('FUEL_BOOK_CACHE', '.cache/extraction_cache.sqlite'))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+# Page number used for whole-document entries (e.g. page count)
+DOCUMENT_KEY = 0
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """SQLite-backed cache of JSON-serializable per-page results.
+
+    Entries are evicted least-recently-used first once the stored values
+    exceed max_bytes.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " file_hash TEXT NOT NULL,"
+            " page INTEGER NOT NULL,"
+            " method TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (file_hash, page, method))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Evict down to the size limit and close the database."""
+        if self.conn is not None:
+            self.evict()
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
+
+    def commit(self):
+        self.conn.commit()
+
+    def get(self, file_hash, page, method):
+        """Return the cached value, or None on a miss."""
+        row = self.conn.execute(
+            "SELECT value FROM entries WHERE file_hash = ? AND page = ? AND method = ?",
+            (file_hash, page, method)
+        ).fetchone()
+        if row is None:
+            return None
+        self.conn.execute(
+            "UPDATE entries SET last_used = ? WHERE file_hash = ? AND page = ? AND method = ?",
+            (time.time(), file_hash, page, method)
+        )
+        # Commit the touch at once: an open write transaction would hold
+        # the database lock against other processes sharing the file
+        self.conn.commit()
+        return json.loads(row[0])
+
+    def get_pages(self, file_hash, method):
+        """Return {page: value} for every cached page of a file and method."""
+        rows = self.conn.execute(
+            "SELECT page, value FROM entries WHERE file_hash = ? AND method = ? AND page != ?",
+            (file_hash, method, DOCUMENT_KEY)
+        ).fetchall()
+        if rows:
+            self.conn.execute(
+                "UPDATE entries SET last_used = ? WHERE file_hash = ? AND method = ?",
+                (time.time(), file_hash, method)
+            )
+            self.conn.commit()
+        return {page: json.loads(value) for page, value in rows}
+
+    def put(self, file_hash, page, method, value):
+        """Store a JSON-serializable value."""
+        encoded = json.dumps(value, ensure_ascii=False)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+            (file_hash, page, method, encoded, len(encoded.encode('utf-8')), time.time())
+        )
+
+    def put_pages(self, file_hash, method, values):
+        """Store {page: value} in one transaction."""
+        now = time.time()
+        rows = []
+        for page, value in values.items():
+            encoded = json.dumps(value, ensure_ascii=False)
+            rows.append((file_hash, page, method, encoded, len(encoded.encode('utf-8')), now))
+        self.conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self.conn.commit()
+
+    def total_bytes(self):
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self):
+        """Drop least-recently-used entries until under max_bytes. Returns bytes freed."""
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return 0
+        freed = 0
+        doomed = []
+        for rowid, size in self.conn.execute("SELECT rowid, size FROM entries ORDER BY last_used"):
+            doomed.append((rowid,))
+            freed += size
+            if freed >= excess:
+                break
+        self.conn.executemany("DELETE FROM entries WHERE rowid = ?", doomed)
+        self.conn.commit()
+        return freed
+
+    def bind(self, file_hash, method):
+        """Return a PageCache for one file and method."""
+        return PageCache(self, file_hash, method)
+
+
+class PageCache:
+    """An ExtractionCache view fixed to one file hash and method."""
+
+    def __init__(self, cache, file_hash, method):
+        self.cache = cache
+        self.file_hash = file_hash
+        self.method = method
+
+    def get(self, page_num):
+        return self.cache.get(self.file_hash, page_num, self.method)
+
+    def put(self, page_num, value):
+        self.cache.put(self.file_hash, page_num, self.method, value)
+
+    def get_pages(self):
+        return self.cache.get_pages(self.file_hash, self.method)
+
+    def put_pages(self, values):
+        self.cache.put_pages(self.file_hash, self.method, values)
+
+
+def cached_page_count(cache, pdf_hash):
+    """Page count recorded for a file, or None."""
+    return cache.get(pdf_hash, DOCUMENT_KEY, 'page_count')
+
+
+def store_page_count(cache, pdf_hash, page_count):
+    cache.put(pdf_hash, DOCUMENT_KEY, 'page_count', page_count)
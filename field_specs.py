@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Declarative field specs shared by the PDF and HTML extractors.
+A FieldSpec says where a field appears in each kind of source: a regex
+for page text (its value in a "(?P<value>...)" group) and/or a label for
+"Label: value" lines such as the detail divs of a review card. Specs also
+carry an optional normalizer, validator and default. FieldMatcher compiles
+a list of specs once: every text pattern becomes one branch of a single
+alternation scanned with one finditer, and labels become a dict lookup.
+"""
+
+import re
+
+VALUE_GROUP = '(?P<value>'
+
+
+class FieldSpec:
+    """One field of a record and how to find it.
+
+    name:      key the value is stored under (several specs may share one)
+    pattern:   regex for page text; without a value group it is a marker
+               whose value is ''
+    label:     text before the first ':' of a "Label: value" line
+    normalize: callable applied to a found value (label values are stripped first)
+    validate:  callable; a normalized value it rejects is ignored
+    default:   value used when the pattern matches but its optional value
+               group does not, e.g. "SHOWERS:" with no count
+    """
+
+    def __init__(self, name, pattern=None, label=None, normalize=None, validate=None, default=None):
+        self.name = name
+        self.pattern = pattern
+        self.label = label
+        self.normalize = normalize
+        self.validate = validate
+        self.default = default
+
+
+class FieldMatcher:
+    """A compiled list of FieldSpecs; the first valid value of each field wins."""
+
+    def __init__(self, specs, flags=re.MULTILINE):
+        self.specs = tuple(specs)
+        branches = []
+        # marker group "f<i>" -> (spec, value group "v<i>" or None for markers,
+        # whether a found value is stored as is)
+        self.branches = {}
+        for i, spec in enumerate(self.specs):
+            if spec.pattern is None:
+                continue
+            value_group = f"v{i}" if VALUE_GROUP in spec.pattern else None
+            pattern = spec.pattern.replace(VALUE_GROUP, f"(?P<{value_group}>")
+            # An empty group closing each branch names the spec in
+            # match.lastgroup; wrapping the whole branch in a group instead
+            # would stop re from skipping ahead on the branches' first characters
+            branches.append(f"{pattern}(?P<f{i}>)")
+            plain = spec.normalize is None and spec.validate is None
+            self.branches[f"f{i}"] = (spec, value_group, plain)
+        self.pattern = re.compile('|'.join(branches), flags) if branches else None
+        self.labels = {spec.label: spec for spec in self.specs if spec.label is not None}
+
+    def scan_text(self, text, fields=None, pos=0, endpos=None):
+        """Fields found in text[pos:endpos], added to fields (a new dict by default)."""
+        if fields is None:
+            fields = {}
+        if self.pattern is None:
+            return fields
+        if endpos is None:
+            endpos = len(text)
+        branches = self.branches
+        defaulted = set()
+        for match in self.pattern.finditer(text, pos, endpos):
+            spec, value_group, plain = branches[match.lastgroup]
+            name = spec.name
+            if name in fields and name not in defaulted:
+                continue
+            value = match.group(value_group) if value_group else ''
+            if plain and value is not None:
+                # Fast path for the common case: nothing to clean or check
+                fields[name] = value
+                defaulted.discard(name)
+            else:
+                self._record(fields, defaulted, spec, value)
+        return fields
+
+    def scan_labels(self, lines, fields=None):
+        """Fields found in "Label: value" lines, added to fields (a new dict by default)."""
+        if fields is None:
+            fields = {}
+        defaulted = set()
+        for line in lines or ():
+            label, colon, value = line.partition(':')
+            spec = self.labels.get(label) if colon else None
+            if spec is None or (spec.name in fields and spec.name not in defaulted):
+                continue
+            self._record(fields, defaulted, spec, value.strip())
+        return fields
+
+    @staticmethod
+    def _record(fields, defaulted, spec, value):
+        if value is not None and spec.normalize is not None:
+            value = spec.normalize(value)
+        if value is not None and spec.validate is not None and not spec.validate(value):
+            value = None
+        if value is not None:
+            fields[spec.name] = value
+            defaulted.discard(spec.name)
+        elif spec.default is not None and spec.name not in fields:
+            fields[spec.name] = spec.default
+            defaulted.add(spec.name)
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Offline geocoding and nearest-station queries.
+Stations are placed at the centroid of their ZIP code (US) or forward
+sortation area (Canada, first three characters of the postal code) using
+a local centroid table - no network lookups. A k-d tree over the station
+coordinates answers nearest(lat, lon, k) and within_radius(lat, lon, miles)
+without scanning every station per query.
+
+The centroid table is a small gzip CSV (postal_code,lat,lon) shipped next
+to this script and loaded by default, so queries work offline. The
+bundled zip_centroids.csv.gz covers US ZIP codes (military APO/FPO codes
+left out). It was built from the GeoNames postal code coordinates embedded
+in the zipcodes package (3.0.0), GeoNames data (https://www.geonames.org/)
+licensed CC BY 4.0. Regenerating it is a maintenance step:
+--build-zip-table builds it from a file on disk (the Census ZCTA
+Gazetteer, zipped or not, or GeoNames US.txt / CA.txt, e.g. to add
+Canadian FSAs), and --fetch-zip-table downloads the public-domain Census
+Gazetteer first.
+"""
+
+import argparse
+import csv
+import gzip
+import heapq
+import io
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import urllib.request
+import zipfile
+from pathlib import Path
+
+from station_table import StationTable
+
+DEFAULT_ZIP_TABLE = Path(os.environ.get('FUEL_BOOK_ZIP_TABLE',
+                                         Path(__file__).resolve().parent / 'zip_centroids.csv.gz'))
+
+# US Census ZCTA Gazetteer (public domain): ZIP code tabulation area
+# centroids, used only by the --fetch-zip-table maintenance step
+GAZETTEER_URL = ('https://www2.census.gov/geo/docs/maps-data/data/gazetteer/'
+                 '2023_Gazetteer/2023_Gaz_zcta_national.zip')
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Postal code at the end of a "City, ST 12345" or "City, ON A1B 2C3" line
+US_ZIP_PATTERN = re.compile(r'\b([0-9]{5})(?:-[0-9]{4})?\s*$')
+CA_POSTAL_PATTERN = re.compile(r'\b([A-Z][0-9][A-Z])\s?[0-9][A-Z][0-9]\s*$')
+
+
+def postal_key(city_state_zip):
+    """Centroid table key for a city/state/zip line: 5-digit ZIP or Canadian FSA."""
+    if not city_state_zip:
+        return None
+    text = city_state_zip.strip().upper()
+    match = US_ZIP_PATTERN.search(text) or CA_POSTAL_PATTERN.search(text)
+    return match.group(1) if match else None
+
+
+def _open_text(path):
+    path = Path(path)
+    if path.suffix == '.zip':
+        # A downloaded Gazetteer archive holds a single text file
+        archive = zipfile.ZipFile(path)
+        return io.TextIOWrapper(archive.open(archive.namelist()[0]), encoding='utf-8')
+    if path.suffix == '.gz':
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def load_zip_centroids(path=DEFAULT_ZIP_TABLE):
+    """Read a postal_code,lat,lon table into {postal_code: (lat, lon)}."""
+    centroids = {}
+    with _open_text(path) as f:
+        for row in csv.reader(f):
+            if not row or row[0] == 'postal_code':
+                continue
+            centroids[row[0]] = (float(row[1]), float(row[2]))
+    return centroids
+
+
+def _source_rows(source):
+    """Yield (postal_code, lat, lon) from a Census Gazetteer or GeoNames file."""
+    with _open_text(source) as f:
+        first = f.readline().rstrip('\n').split('\t')
+        if first[0].strip() == 'GEOID':
+            # Census ZCTA Gazetteer: GEOID ... INTPTLAT INTPTLONG (tab separated)
+            columns = [column.strip() for column in first]
+            key, lat, lon = columns.index('GEOID'), columns.index('INTPTLAT'), columns.index('INTPTLONG')
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                yield fields[key].strip(), fields[lat].strip(), fields[lon].strip()
+            return
+        # GeoNames: country, postal code, place, admin names/codes..., lat, lon, accuracy
+        for fields in [first] + [line.rstrip('\n').split('\t') for line in f]:
+            if len(fields) < 11:
+                continue
+            postal_code = fields[1].strip().upper()
+            if fields[0] == 'CA':
+                postal_code = postal_code[:3]
+            yield postal_code, fields[9], fields[10]
+
+
+def build_zip_table(source, output=DEFAULT_ZIP_TABLE):
+    """Normalize a downloaded postal code file into the centroid table.
+
+    Codes listed more than once (GeoNames places sharing an FSA) are
+    averaged. Returns the number of postal codes written.
+    """
+    sums = {}
+    for postal_code, lat, lon in _source_rows(source):
+        if not postal_code or not lat or not lon:
+            continue
+        total = sums.setdefault(postal_code, [0.0, 0.0, 0])
+        total[0] += float(lat)
+        total[1] += float(lon)
+        total[2] += 1
+
+    with gzip.open(output, 'wt', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['postal_code', 'lat', 'lon'])
+        for postal_code in sorted(sums):
+            lat, lon, count = sums[postal_code]
+            writer.writerow([postal_code, f"{lat / count:.5f}", f"{lon / count:.5f}"])
+    return len(sums)
+
+
+def fetch_zip_table(output=DEFAULT_ZIP_TABLE, url=GAZETTEER_URL):
+    """Download the Census ZCTA Gazetteer and build the centroid table from it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / Path(url).name
+        urllib.request.urlretrieve(url, source)
+        return build_zip_table(source, output)
+
+
+def _to_xyz(lat, lon):
+    """Unit-sphere coordinates; straight-line order matches great-circle order."""
+    lat, lon = math.radians(lat), math.radians(lon)
+    cos_lat = math.cos(lat)
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+
+def _chord_to_miles(chord):
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, chord / 2))
+
+
+def _miles_to_chord(miles):
+    angle = min(math.pi, miles / EARTH_RADIUS_MILES)
+    return 2 * math.sin(angle / 2)
+
+
+class KDTree:
+    """Static 3-d tree over unit-sphere points, stored as a flat node list."""
+
+    def __init__(self, points):
+        # Each node: (point, item index, split axis, left node, right node)
+        self.nodes = []
+        self.root = self._build([(point, index) for index, point in enumerate(points)], 0)
+
+    def _build(self, entries, depth):
+        if not entries:
+            return -1
+        axis = depth % 3
+        entries.sort(key=lambda entry: entry[0][axis])
+        middle = len(entries) // 2
+        node = len(self.nodes)
+        self.nodes.append(None)
+        left = self._build(entries[:middle], depth + 1)
+        right = self._build(entries[middle + 1:], depth + 1)
+        point, index = entries[middle]
+        self.nodes[node] = (point, index, axis, left, right)
+        return node
+
+    def nearest(self, target, k):
+        """Return [(squared distance, item index)] of the k closest points."""
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        best = []  # max-heap of (-squared distance, item index)
+        stack = [(self.root, 0.0)]  # (node, lower bound on its squared distance)
+        while stack:
+            node, bound = stack.pop()
+            if node == -1 or (len(best) == k and bound >= -best[0][0]):
+                continue
+            point, index, axis, left, right = self.nodes[node]
+            distance = sum((a - b) ** 2 for a, b in zip(point, target))
+            if len(best) < k:
+                heapq.heappush(best, (-distance, index))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, index))
+            offset = target[axis] - point[axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            # The far side is pushed first so the near side is searched first;
+            # by the time it is popped the bound usually rules it out
+            stack.append((far, max(bound, offset * offset)))
+            stack.append((near, bound))
+        return sorted((-distance, index) for distance, index in best)
+
+    def within(self, target, radius):
+        """Return [(squared distance, item index)] of points within radius."""
+        radius_sq = radius * radius
+        found = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node == -1:
+                continue
+            point, index, axis, left, right = self.nodes[node]
+            distance = sum((a - b) ** 2 for a, b in zip(point, target))
+            if distance <= radius_sq:
+                found.append((distance, index))
+            offset = target[axis] - point[axis]
+            if offset - radius <= 0:
+                stack.append(left)
+            if offset + radius >= 0:
+                stack.append(right)
+        return sorted(found)
+
+
+class StationIndex:
+    """Nearest-station and radius queries over geocoded stations."""
+
+    def __init__(self, stations, centroids):
+        self.stations = []
+        self.coordinates = []
+        self.ungeocoded = []
+        for station in stations:
+            position = self.geocode(station, centroids)
+            if position is None:
+                self.ungeocoded.append(station)
+                continue
+            self.stations.append(station)
+            self.coordinates.append(position)
+        self._trees = {}  # site type (None = all) -> (KDTree, station positions)
+
+    @staticmethod
+    def geocode(station, centroids):
+        """(lat, lon) for a station: explicit coordinates, else its postal centroid."""
+        if station.get('lat') is not None and station.get('lon') is not None:
+            return float(station['lat']), float(station['lon'])
+        return centroids.get(postal_key(station.get('city_state_zip')))
+
+    @classmethod
+    def from_data(cls, data, centroids):
+        """Index a BackendData dict or StationTable."""
+        if isinstance(data, StationTable):
+            stations = [station for _, station in data.iter_stations()]
+        else:
+            stations = [station for info in data.values() for station in info['fuel_stations']]
+        return cls(stations, centroids)
+
+    def _tree(self, site_type):
+        """k-d tree over all stations or one site type, built on first use."""
+        if site_type not in self._trees:
+            positions = [position for position, station in enumerate(self.stations)
+                         if site_type is None or station.get('site_type') == site_type]
+            points = [_to_xyz(*self.coordinates[position]) for position in positions]
+            self._trees[site_type] = (KDTree(points), positions)
+        return self._trees[site_type]
+
+    def _results(self, hits, positions):
+        return [(_chord_to_miles(math.sqrt(distance)), self.stations[positions[index]])
+                for distance, index in hits]
+
+    def nearest(self, lat, lon, k=1, site_type=None):
+        """The k closest stations as [(miles, station)], closest first."""
+        tree, positions = self._tree(site_type)
+        return self._results(tree.nearest(_to_xyz(lat, lon), k), positions)
+
+    def within_radius(self, lat, lon, miles, site_type=None):
+        """Every station within `miles` as [(miles, station)], closest first."""
+        tree, positions = self._tree(site_type)
+        return self._results(tree.within(_to_xyz(lat, lon), _miles_to_chord(miles)), positions)
+
+
+def main():
+    """Query stations near a point, or build the centroid table."""
+    parser = argparse.ArgumentParser(description="Nearest fuel station queries")
+    parser.add_argument('data', nargs='?', default='fuel_stations_data.json',
+                        help="Extracted station JSON (default: fuel_stations_data.json)")
+    parser.add_argument('--near', nargs=2, type=float, metavar=('LAT', 'LON'),
+                        help="Point to search around")
+    parser.add_argument('-k', type=int, default=5, help="Number of nearest stations (default: 5)")
+    parser.add_argument('--radius', type=float, help="Return every station within this many miles")
+    parser.add_argument('--site-type', help="Only stations of this site type, e.g. Exclusive")
+    parser.add_argument('--zip-table', default=DEFAULT_ZIP_TABLE,
+                        help=f"Postal code centroid table (default: {DEFAULT_ZIP_TABLE})")
+    parser.add_argument('--build-zip-table', metavar='SOURCE',
+                        help="Maintenance: rebuild --zip-table from a Census ZCTA Gazetteer or GeoNames file")
+    parser.add_argument('--fetch-zip-table', action='store_true',
+                        help="Maintenance: download the Census ZCTA Gazetteer and rebuild --zip-table "
+                             "(needs network access)")
+    args = parser.parse_args()
+
+    if args.build_zip_table or args.fetch_zip_table:
+        if args.build_zip_table:
+            count = build_zip_table(args.build_zip_table, args.zip_table)
+        else:
+            print(f"⬇️  Downloading {GAZETTEER_URL}")
+            try:
+                count = fetch_zip_table(args.zip_table)
+            except OSError as e:
+                print(f"Error: could not download the Gazetteer: {e}")
+                sys.exit(1)
+        print(f"🗺️  Wrote {count} postal code centroids to {args.zip_table}")
+        return
+
+    if not Path(args.zip_table).exists():
+        print(f"Error: centroid table not found: {args.zip_table}")
+        print("Rebuild it with --build-zip-table <US.txt | 2023_Gaz_zcta_national.zip>, "
+              "or download the Census Gazetteer with --fetch-zip-table")
+        sys.exit(1)
+    if not args.near:
+        parser.error("--near LAT LON is required for queries")
+    if args.k < 1:
+        parser.error("-k must be at least 1")
+
+    with open(args.data, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    index = StationIndex.from_data(data, load_zip_centroids(args.zip_table))
+    print(f"📍 Indexed {len(index.stations)} stations ({len(index.ungeocoded)} without a known postal code)")
+
+    lat, lon = args.near
+    if args.radius is not None:
+        results = index.within_radius(lat, lon, args.radius, site_type=args.site_type)
+    else:
+        results = index.nearest(lat, lon, args.k, site_type=args.site_type)
+    for miles, station in results:
+        print(f"  {miles:7.1f} mi  {station['name']}  ({station.get('city_state_zip', '')})")
+
+
+if __name__ == "__main__":
+    main()
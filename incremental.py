@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Incremental re-extraction between fuel book revisions.
+Fingerprints each page's content stream and re-parses only pages whose
+fingerprint is new, reusing the previous fuel_stations_data.json for the
+rest. Also reports which stations were added, removed or modified.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from extract_fuel_data import scan_method, scan_session_page, merge_page_results
+from pdf_session import PDFSession
+
+
+def manifest_path(output_file):
+    """Sidecar holding per-page fingerprints, e.g. fuel_stations_data.pages.json."""
+    output_file = Path(output_file)
+    return output_file.with_name(f"{output_file.stem}.pages.json")
+
+
+def page_fingerprint(page):
+    """Hash of a page's raw content stream."""
+    return hashlib.sha256(page.read_contents()).hexdigest()
+
+
+def load_previous(output_file, parser='text'):
+    """Return (data, manifest) from the last run with parser, or (None, None)."""
+    output_file = Path(output_file)
+    sidecar = manifest_path(output_file)
+    if not output_file.exists() or not sidecar.exists():
+        return None, None
+    with open(sidecar, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('parser') != scan_method(parser):
+        return None, None
+    with open(output_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data, manifest
+
+
+def previous_page_results(data, manifest):
+    """Rebuild per-page scan results from a previous run, keyed by fingerprint."""
+    by_page = {}
+    for page_num, page_info in manifest['pages'].items():
+        by_page[int(page_num)] = {
+            'page': int(page_num),
+            'kind': page_info['kind'],
+            'terminal': None,
+            'state': page_info['state'],
+            'stations': []
+        }
+    for key, info in data.items():
+        for terminal in info['terminals']:
+            if terminal.get('page') in by_page:
+                by_page[terminal['page']]['terminal'] = terminal
+        for station in info['fuel_stations']:
+            if station.get('page') in by_page:
+                by_page[station['page']]['stations'].append(station)
+
+    # Pages whose stations did not all make it into the data (e.g. before
+    # the first state header) cannot be rebuilt and are re-parsed instead
+    return {manifest['pages'][str(page_num)]['fingerprint']: result
+            for page_num, result in by_page.items()
+            if len(result['stations']) == manifest['pages'][str(page_num)]['stations']}
+
+
+def renumber(result, page_num):
+    """Move a reused page result to its page number in the new revision."""
+    result['page'] = page_num
+    if result['terminal']:
+        result['terminal']['page'] = page_num
+    for station in result['stations']:
+        station['page'] = page_num
+    return result
+
+
+def station_key(station):
+    """Identity of a station across revisions."""
+    return station.get('navigo_id') or f"{station.get('type')}#{station.get('number')}"
+
+
+def diff_stations(old_data, new_data):
+    """Compare two datasets; returns added, removed and modified stations."""
+    def index(data):
+        stations = {}
+        for key, info in (data or {}).items():
+            for station in info['fuel_stations']:
+                stations[station_key(station)] = station
+        return stations
+
+    old, new = index(old_data), index(new_data)
+    diff = {'added': [], 'removed': [], 'modified': []}
+    for key, station in new.items():
+        if key not in old:
+            diff['added'].append(station)
+            continue
+        changes = {field: {'old': old[key].get(field), 'new': station.get(field)}
+                   for field in set(old[key]) | set(station)
+                   if field != 'page' and old[key].get(field) != station.get(field)}
+        if changes:
+            diff['modified'].append({'key': key, 'changes': changes})
+    diff['removed'] = [station for key, station in old.items() if key not in new]
+    return diff
+
+
+def extract_incremental(pdf_path, output_file, parser='text'):
+    """Re-extract only changed pages of pdf_path against the last output.
+
+    Returns (data, manifest, diff, reparsed_page_count). Falls back to a
+    full scan when there is no usable previous run with the same parser.
+    """
+    old_data, old_manifest = load_previous(output_file, parser)
+    reusable = previous_page_results(old_data, old_manifest) if old_data else {}
+
+    page_results = []
+    pages = {}
+    reparsed = 0
+    with PDFSession(pdf_path) as session:
+        for page_index in range(session.page_count):
+            page_num = page_index + 1
+            fingerprint = page_fingerprint(session.page(page_index))
+            result = reusable.pop(fingerprint, None)
+            if result is not None:
+                result = renumber(result, page_num)
+            else:
+                result = scan_session_page(session, page_index, parser)
+                reparsed += 1
+            page_results.append(result)
+            pages[str(page_num)] = {
+                'fingerprint': fingerprint,
+                'kind': result['kind'],
+                'state': result['state'],
+                'stations': len(result['stations'])
+            }
+
+    data = merge_page_results(page_results)
+    manifest = {'source': Path(pdf_path).name, 'parser': scan_method(parser), 'pages': pages}
+    return data, manifest, diff_stations(old_data, data), reparsed
+
+
+def save_manifest(manifest, output_file):
+    """Write the page fingerprint sidecar next to the output file."""
+    with open(manifest_path(output_file), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
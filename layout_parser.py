@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Layout-aware station parser.
+Uses PyMuPDF's "dict" text output so every line comes with its bounding
+box and font. Station cards are grouped by column and position instead of
+by raw line order, so multi-column pages parse in one pass and fields are
+labelled by what they contain rather than by lines[1]/lines[2] indexing.
+"""
+
+import re
+
+from lazy_imports import LazyModule
+
+from station_patterns import STATION_PATTERN, CITY_STATE_ZIP_PATTERN, collect_fields, site_type
+
+fitz = LazyModule('fitz')  # PyMuPDF
+
+# Highway/exit line, e.g. "I-20/I-59, Exit 77" or "Prov Hwy. 401, Exit 230"
+EXIT_PATTERN = re.compile(r'\bExit\b|^(?:I|US|SR|Hwy)[-\s]?[0-9]+')
+
+# Lines holding labelled fields: "Ph: ...", "Fx: ...", "NaviGo: ..."
+FIELD_LINE_PATTERN = re.compile(r'^(?:Ph|Fx|NaviGo):')
+
+# Lines made only of site type markers, e.g. "★" or "● Limited"
+MARKER_ONLY_PATTERN = re.compile(r'^[\s★●]*(?:Exclusive|Primary|Limited)?[\s★●]*$')
+
+# Horizontal slack (points) when deciding which column a line belongs to
+COLUMN_TOLERANCE = 12
+
+
+def page_text_and_layout(page):
+    """Plain text of a page plus the TextPage it came from.
+
+    Passing the TextPage on to parse_fuel_stations_layout means a page
+    classified by its text and then parsed by layout is only analysed by
+    MuPDF once.
+    """
+    textpage = page.get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+    return page.get_text(textpage=textpage), textpage
+
+
+def page_lines(page, textpage=None):
+    """Text lines of a page as dicts with text, bbox and leading font."""
+    lines = []
+    layout = page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT, textpage=textpage)
+    for block in layout['blocks']:
+        for line in block.get('lines', []):
+            spans = line['spans']
+            text = "".join(span['text'] for span in spans).strip()
+            if not text:
+                continue
+            x0, y0, x1, y1 = line['bbox']
+            lines.append({
+                'text': text,
+                'x0': x0, 'y0': y0, 'x1': x1, 'y1': y1,
+                'font': (spans[0]['font'], round(spans[0]['size'], 1))
+            })
+    return lines
+
+
+def group_cards(lines):
+    """Assign each line to the station header above it in the same column.
+
+    Returns [(header_line, body_lines)] ordered by column, then top to bottom.
+    """
+    headers = [line for line in lines if STATION_PATTERN.match(line['text'])]
+    if not headers:
+        return []
+
+    # Columns are clusters of header left edges
+    column_edges = []
+    for x0 in sorted(header['x0'] for header in headers):
+        if not column_edges or x0 - column_edges[-1] > COLUMN_TOLERANCE:
+            column_edges.append(x0)
+
+    def column_of(line):
+        column = 0
+        for index, edge in enumerate(column_edges):
+            if line['x0'] + COLUMN_TOLERANCE >= edge:
+                column = index
+        return column
+
+    columns = [[] for _ in column_edges]
+    for header in headers:
+        columns[column_of(header)].append(header)
+    for column in columns:
+        column.sort(key=lambda line: line['y0'])
+
+    cards = {id(header): (header, []) for header in headers}
+    for line in lines:
+        if id(line) in cards:
+            continue
+        owner = None
+        for header in columns[column_of(line)]:
+            if header['y0'] <= line['y0'] + 1:
+                owner = header
+            else:
+                break
+        if owner is not None:
+            cards[id(owner)][1].append(line)
+
+    ordered = []
+    for column in columns:
+        for header in column:
+            header, body = cards[id(header)]
+            body.sort(key=lambda line: (round(line['y0']), line['x0']))
+            ordered.append((header, body))
+    return ordered
+
+
+def body_font(body):
+    """Most common font among a card's body lines."""
+    counts = {}
+    for line in body:
+        counts[line['font']] = counts.get(line['font'], 0) + 1
+    return max(counts, key=counts.get) if counts else None
+
+
+def parse_card(header, body, state, page_num):
+    """Label the lines of one station card; same record shape as parse_fuel_stations."""
+    match = STATION_PATTERN.match(header['text'])
+    name_parts = [match.group(3).strip()]
+    fields = collect_fields(header['text'], {}, match.end())
+    address = None
+    city_state_zip = None
+    exit_info = None
+
+    # A name that wraps keeps the header's font; only trust that signal
+    # when the header is set in a different font from the body
+    text_font = body_font(body)
+    name_font = header['font'] if header['font'] != text_font else None
+    past_name = False
+
+    for line in body:
+        text = line['text']
+        collect_fields(text, fields)
+        if FIELD_LINE_PATTERN.match(text):
+            past_name = True
+            continue
+        if MARKER_ONLY_PATTERN.match(text):
+            continue
+        if not past_name and name_font is not None and line['font'] == name_font:
+            name_parts.append(text)
+            continue
+        past_name = True
+        if city_state_zip is None and CITY_STATE_ZIP_PATTERN.search(text):
+            city_state_zip = text
+        elif exit_info is None and EXIT_PATTERN.search(text):
+            exit_info = text
+        elif address is None:
+            address = text
+
+    station = {
+        'page': page_num,
+        'state': state,
+        'number': match.group(1),
+        'type': match.group(2),
+        'name': f"#{match.group(1)} {match.group(2)} {' '.join(name_parts)}"
+    }
+    if address:
+        station['address'] = address
+    if city_state_zip:
+        station['city_state_zip'] = city_state_zip
+    if exit_info:
+        station['exit_info'] = exit_info
+    for field in ('phone', 'fax', 'navigo_id'):
+        if field in fields:
+            station[field] = fields[field]
+    station['site_type'] = site_type(fields)
+    return station
+
+
+def parse_fuel_stations_layout(page, state, page_num, textpage=None):
+    """Parse fuel station entries from a PyMuPDF page (and optionally its
+    TextPage, see page_text_and_layout) using its layout."""
+    return [parse_card(header, body, state, page_num)
+            for header, body in group_cards(page_lines(page, textpage))]
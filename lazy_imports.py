@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Deferred imports for heavy optional backends.
+LazyModule stands in for a module and imports it on first attribute
+access, so `fitz = LazyModule('fitz')` keeps call sites like fitz.open()
+unchanged while scripts that never touch PyMuPDF, pdfplumber, pypdf or
+pandas do not pay for importing them.
+"""
+
+import importlib
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first use."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        value = getattr(self._module, attr)
+        # Later lookups of the same attribute skip __getattr__
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<LazyModule {self._name!r} ({state})>"
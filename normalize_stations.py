@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Post-extraction normalization into the frontend's FuelStation records.
+Does what flattenStations() in src/utils/data-transformer.ts does per
+record on every client load, once and column-wise: all stations go into
+one DataFrame and the city/state/zip split, phone formatting, brand and
+site type mapping run as vectorized .str operations. The output is the
+flat list of FuelStation-shaped records (camelCase keys) that clients
+can load as is.
+
+Usage: python normalize_stations.py [fuel_stations_data.json] [--output fuel_stations_normalized.json]
+"""
+
+import argparse
+import json
+
+from lazy_imports import LazyModule
+from station_table import STATION_FIELDS, StationTable
+
+pd = LazyModule('pandas')
+
+# Fallbacks from src/config/constants.ts
+DEFAULT_STATION_TYPE = 'Primary'
+DEFAULT_BRAND = 'TA'
+
+# Site types in the order normalizeStationType() checks them
+STATION_TYPES = ('Exclusive', 'Primary', 'Limited')
+
+# "City, ST ZIP" split the way parseCityStateZip() splits it: the city is
+# the trimmed text before the first comma; state and zip are the first two
+# words after it, and only when there is exactly one comma
+CITY_STATE_ZIP_PARTS = r'^\s*(?P<city>[^,]*?)\s*(?:,\s*(?P<state>[^\s,]*)\s*(?P<zip>[^\s,]*)[^,]*$|,)'
+
+BRANDS = {'TA': 'TA', 'PETRO': 'PETRO', 'COVENANT': 'Covenant'}
+
+# Keys of a FuelStation record, in src/types/fuel-station.ts order
+STATION_COLUMNS = ('id', 'stationName', 'address', 'city', 'state', 'zip', 'stationType',
+                   'brand', 'phone', 'fax', 'navigoId', 'exitInfo')
+TERMINAL_COLUMNS = ('id', 'stationName', 'address', 'city', 'state', 'zip', 'stationType',
+                    'brand', 'phone', 'navigoId', 'amenities', 'showers', 'parking', 'shop')
+
+
+def split_city_state_zip(values):
+    """Vectorized parseCityStateZip(): "Corning, CA 96021" -> Corning / CA / 96021.
+
+    Returns a DataFrame with city, state and zip columns ('' when absent).
+    """
+    parts = values.fillna('').astype(str).str.extract(CITY_STATE_ZIP_PARTS)
+    return parts.fillna('')
+
+
+def normalize_phones(values):
+    """Format ten-digit numbers as "(555) 555-5555"; other values are kept stripped."""
+    digits = values.str.replace(r'[^0-9]', '', regex=True)
+    digits = digits.where(~((digits.str.len() == 11) & digits.str.startswith('1')), digits.str[1:])
+    formatted = '(' + digits.str[:3] + ') ' + digits.str[3:6] + '-' + digits.str[6:]
+    return formatted.where(digits.str.len() == 10, values.str.strip())
+
+
+def normalize_station_types(values):
+    """normalizeStationType(): first of Exclusive/Primary/Limited named in the value."""
+    lowered = values.fillna('').astype(str).str.lower()
+    result = pd.Series(DEFAULT_STATION_TYPE, index=values.index, dtype=object)
+    # Assign in reverse so the first type in STATION_TYPES wins
+    for station_type in reversed(STATION_TYPES):
+        result = result.mask(lowered.str.contains(station_type.lower(), regex=False), station_type)
+    return result
+
+
+def normalize_brands(values):
+    """normalizeBrand(): TA, PETRO or Covenant, else DEFAULT_BRAND."""
+    return values.fillna('').astype(str).str.upper().map(BRANDS).fillna(DEFAULT_BRAND)
+
+
+def _column(frame, name):
+    if name in frame:
+        return frame[name]
+    return pd.Series(None, index=frame.index, dtype=object)
+
+
+def normalize_station_frame(stations):
+    """FuelStation columns for a frame of extracted stations (with a 'region' column)."""
+    location = split_city_state_zip(_column(stations, 'city_state_zip'))
+    return pd.DataFrame({
+        'id': stations['region'] + '-' + _column(stations, 'number').fillna('').astype(str),
+        'stationName': _column(stations, 'name'),
+        'address': _column(stations, 'address'),
+        'city': location['city'],
+        'state': location['state'],
+        'zip': location['zip'],
+        'stationType': normalize_station_types(_column(stations, 'site_type')),
+        'brand': normalize_brands(_column(stations, 'type')),
+        'phone': normalize_phones(_column(stations, 'phone')),
+        'fax': normalize_phones(_column(stations, 'fax')),
+        'navigoId': _column(stations, 'navigo_id'),
+        'exitInfo': _column(stations, 'exit_info'),
+    }, columns=STATION_COLUMNS)
+
+
+def normalize_terminal_frame(terminals):
+    """FuelStation columns for a frame of extracted Covenant terminals."""
+    address = _column(terminals, 'address')
+    location = split_city_state_zip(address)
+    return pd.DataFrame({
+        'id': 'COVENANT-' + pd.Series(range(len(terminals)), index=terminals.index).astype(str),
+        'stationName': _column(terminals, 'name'),
+        'address': address.fillna(''),
+        'city': location['city'],
+        'state': location['state'],
+        'zip': location['zip'],
+        'stationType': 'Covenant Terminal',
+        'brand': 'Covenant',
+        'phone': normalize_phones(_column(terminals, 'phone')),
+        'navigoId': _column(terminals, 'navigo_id'),
+        'amenities': _column(terminals, 'amenities'),
+        'showers': _column(terminals, 'showers'),
+        'parking': _column(terminals, 'parking'),
+        'shop': _column(terminals, 'shop'),
+    }, columns=TERMINAL_COLUMNS)
+
+
+def _records(frame):
+    """Frame rows as dicts, leaving out missing optional values (like undefined in TS)."""
+    names = list(frame.columns)
+    columns = [frame[name].astype(object).where(frame[name].notna(), None).tolist() for name in names]
+    return [{name: value for name, value in zip(names, row) if value is not None}
+            for row in zip(*columns)]
+
+
+def station_frame(data):
+    """Every state's stations in one frame with a 'region' column (None if there are none).
+
+    A StationTable's columns go into the frame as they are, without
+    building a dict per station first.
+    """
+    if isinstance(data, StationTable):
+        rows_by_region = data.rows_by_region()
+        rows = [row for region in data.regions if region != 'COVENANT_TERMINALS'
+                for row in rows_by_region[region]]
+        if not rows:
+            return None
+        frame = {'region': [data.region_of(row) for row in rows]}
+        frame.update((field, data.column(field, rows)) for field in STATION_FIELDS)
+        return pd.DataFrame(frame)
+
+    stations = [dict(station, region=region)
+                for region, info in data.items() if region != 'COVENANT_TERMINALS'
+                for station in info['fuel_stations']]
+    return pd.DataFrame(stations) if stations else None
+
+
+def normalize_stations(data):
+    """Flat FuelStation records for extracted data (a dict or a StationTable), in
+    flattenStations() order: every state's stations, then the Covenant terminals."""
+    stations = station_frame(data)
+    if isinstance(data, StationTable):
+        terminals = data.terminals.get('COVENANT_TERMINALS', [])
+    else:
+        terminals = data.get('COVENANT_TERMINALS', {}).get('terminals', [])
+
+    records = []
+    if stations is not None:
+        records += _records(normalize_station_frame(stations))
+    if terminals:
+        records += _records(normalize_terminal_frame(pd.DataFrame(terminals)))
+    return records
+
+
+def write_normalized(data, path):
+    """Normalize data and write the FuelStation records as JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(normalize_stations(data), f, indent=2, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize extracted stations into FuelStation records")
+    parser.add_argument('data', nargs='?', default="fuel_stations_data.json",
+                        help="Extracted station JSON")
+    parser.add_argument('--output', default="fuel_stations_normalized.json",
+                        help="Output JSON file")
+    args = parser.parse_args()
+
+    with open(args.data, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    records = normalize_stations(data)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+
+    print(f"✅ Normalized {len(records)} stations")
+    print(f"📄 Data saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
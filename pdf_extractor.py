@@ -4,75 +4,172 @@ PDF Extraction Utility
 Supports multiple extraction methods for text, tables, images, and metadata.
 """
 
+import argparse
 import os
 import sys
+from functools import partial
 from pathlib import Path
 import json
 
-# PDF Libraries
-import pypdf
-import pdfplumber
-import fitz  # PyMuPDF
-from pdfminer.high_level import extract_text as pdfminer_extract
-import pandas as pd
+# PDF libraries are imported on first use (see lazy_imports.py)
+from lazy_imports import LazyModule
+from pdf_session import (
+    PDFSession, TextCollector, MetadataCollector, TableCollector, ImageCollector,
+    iter_pages_parallel, page_marker, table_backend
+)
+from table_writers import CSVTableWriter, ColumnarTableWriter, TableWriters
+from extraction_cache import ExtractionCache, file_hash, cached_page_count, store_page_count
+from text_backends import BACKENDS, iter_backend_text, rank_backends
+
+pdfplumber = LazyModule('pdfplumber')
+fitz = LazyModule('fitz')  # PyMuPDF
+pd = LazyModule('pandas')
+
+
+# Text method names: a registered backend, or 'auto' to pick the fastest
+TEXT_METHODS = ('auto',) + tuple(BACKENDS)
+
+
+def _iter_backend_pages(pdf_path, backends):
+    """Yield (page_num, backend name, text) with one open handle per backend."""
+    for page_num, (backend, text) in enumerate(iter_backend_text(pdf_path, backends), 1):
+        yield page_num, backend, text
+
+
+def _text_chunk(pdf_path, start, stop, backends=()):
+    """Process-pool worker: (backend name, text) of pages [start, stop) with private handles."""
+    return list(iter_backend_text(pdf_path, backends, start, stop))
 
 
 class PDFExtractor:
     """Comprehensive PDF extraction tool supporting multiple methods."""
     
-    def __init__(self, pdf_path):
-        """Initialize with path to PDF file."""
+    def __init__(self, pdf_path, cache=None):
+        """Initialize with path to PDF file and an optional ExtractionCache."""
         self.pdf_path = Path(pdf_path)
         if not self.pdf_path.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        self.cache = cache
+        self._file_hash = None
+        self._ranked_backends = None
+    
+    def _page_cache(self, method):
+        """PageCache for this file and method, or None when caching is off."""
+        if self.cache is None:
+            return None
+        if self._file_hash is None:
+            self._file_hash = file_hash(self.pdf_path)
+        return self.cache.bind(self._file_hash, method)
+    
+    def text_backends(self, method='pymupdf'):
+        """Backends to try for method, in order; 'auto' ranks them on sample pages."""
+        if method == 'auto':
+            if self._ranked_backends is None:
+                self._ranked_backends = rank_backends(self.pdf_path)
+            return self._ranked_backends
+        if method not in BACKENDS:
+            raise ValueError(f"Unknown text method: {method} (choose from {', '.join(TEXT_METHODS)})")
+        return [method]
+    
+    def iter_text(self, method='pymupdf', workers=1):
+        """Stream (page_num, text) pairs without building the whole document string.
+
+        workers > 1 (or 0 for all cores) splits pages across processes;
+        pages are still yielded in order. method 'auto' uses the fastest
+        backend for this file and falls back to the others page by page.
+        """
+        backends = self.text_backends(method)
+        if self.cache is not None:
+            yield from self._iter_text_cached(backends, workers)
+            return
+        for page_num, _, page_text in self._iter_text_pages(backends, workers):
+            yield page_num, page_text
+    
+    def _iter_text_pages(self, backends, workers):
+        """Yield (page_num, backend name, text)."""
+        if workers != 1:
+            chunk_fn = partial(_text_chunk, backends=tuple(backends))
+            for page_num, (backend, text) in enumerate(iter_pages_parallel(chunk_fn, self.pdf_path, workers), 1):
+                yield page_num, backend, text
+        else:
+            yield from _iter_backend_pages(self.pdf_path, backends)
+    
+    def _iter_text_cached(self, backends, workers):
+        """iter_text backed by the cache; a partial hit re-extracts the file.
+
+        Each page is cached under the backend that produced it, so text a
+        fallback backend supplied is never served as another backend's.
+        A page is read from the first backend in order that has it cached.
+        """
+        page_caches = {backend: self._page_cache(f"text:{backend}") for backend in backends}
+        page_count = cached_page_count(self.cache, self._file_hash)
+        cached = {}
+        for backend in reversed(backends):
+            cached.update(page_caches[backend].get_pages())
+        if page_count is not None and len(cached) == page_count:
+            for page_num in range(1, page_count + 1):
+                yield page_num, cached[page_num]
+            return
+        
+        page_count = 0
+        for page_num, backend, page_text in self._iter_text_pages(backends, workers):
+            page_caches[backend].put(page_num, page_text)
+            page_count = page_num
+            yield page_num, page_text
+        store_page_count(self.cache, self._file_hash, page_count)
+        self.cache.commit()
     
-    def extract_text_pypdf(self):
+    def write_text(self, sink, method='pymupdf', workers=1):
+        """Write extracted text page by page to a path or text file object.
+
+        Returns the number of pages written.
+        """
+        if isinstance(sink, (str, os.PathLike)):
+            with open(sink, 'w', encoding='utf-8') as f:
+                return self.write_text(f, method, workers)
+        
+        page_count = 0
+        for page_num, page_text in self.iter_text(method, workers):
+            sink.write(page_marker(page_num))
+            sink.write(page_text)
+            page_count += 1
+        return page_count
+    
+    def _join_text(self, method, workers):
+        return "".join(page_marker(page_num) + page_text
+                       for page_num, page_text in self.iter_text(method, workers))
+    
+    def extract_text_pypdf(self, workers=1):
         """Extract text using pypdf (basic method)."""
         print(f"Extracting text using pypdf from {self.pdf_path.name}...")
-        text = ""
-        with open(self.pdf_path, 'rb') as file:
-            reader = pypdf.PdfReader(file)
-            for page_num, page in enumerate(reader.pages, 1):
-                text += f"\n--- Page {page_num} ---\n"
-                text += page.extract_text()
-        return text
-    
-    def extract_text_pdfplumber(self):
+        return self._join_text('pypdf', workers)
+    
+    def extract_text_pdfplumber(self, workers=1):
         """Extract text using pdfplumber (better layout preservation)."""
         print(f"Extracting text using pdfplumber from {self.pdf_path.name}...")
-        text = ""
-        with pdfplumber.open(self.pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                text += f"\n--- Page {page_num} ---\n"
-                text += page.extract_text() or ""
-        return text
+        return self._join_text('pdfplumber', workers)
     
-    def extract_text_pymupdf(self):
+    def extract_text_pymupdf(self, workers=1):
         """Extract text using PyMuPDF (fast and accurate)."""
         print(f"Extracting text using PyMuPDF from {self.pdf_path.name}...")
-        text = ""
-        doc = fitz.open(self.pdf_path)
-        for page_num, page in enumerate(doc, 1):
-            text += f"\n--- Page {page_num} ---\n"
-            text += page.get_text()
-        doc.close()
-        return text
+        return self._join_text('pymupdf', workers)
     
-    def extract_tables_pdfplumber(self):
-        """Extract tables using pdfplumber."""
-        print(f"Extracting tables using pdfplumber from {self.pdf_path.name}...")
-        all_tables = []
+    def iter_tables(self):
+        """Yield tables one at a time as {'page', 'table_number', 'dataframe'}."""
         with pdfplumber.open(self.pdf_path) as pdf:
             for page_num, page in enumerate(pdf.pages, 1):
                 tables = page.extract_tables()
                 for table_num, table in enumerate(tables, 1):
-                    df = pd.DataFrame(table[1:], columns=table[0])
-                    all_tables.append({
+                    yield {
                         'page': page_num,
                         'table_number': table_num,
-                        'dataframe': df
-                    })
-        return all_tables
+                        'dataframe': pd.DataFrame(table[1:], columns=table[0])
+                    }
+    
+    def extract_tables_pdfplumber(self):
+        """Extract tables using pdfplumber."""
+        print(f"Extracting tables using pdfplumber from {self.pdf_path.name}...")
+        return list(self.iter_tables())
     
     def extract_metadata(self):
         """Extract PDF metadata."""
@@ -84,73 +181,53 @@ class PDFExtractor:
         return metadata
     
     def extract_images_pymupdf(self, output_dir='output/images'):
-        """Extract images using PyMuPDF."""
+        """Extract images using PyMuPDF, one file per distinct image."""
         print(f"Extracting images from {self.pdf_path.name}...")
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-        
-        doc = fitz.open(self.pdf_path)
-        image_list = []
-        
-        for page_num, page in enumerate(doc, 1):
-            image_dict = page.get_images()
-            for img_num, img in enumerate(image_dict, 1):
-                xref = img[0]
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                image_ext = base_image["ext"]
-                
-                image_name = f"page{page_num}_img{img_num}.{image_ext}"
-                image_path = output_path / image_name
-                
-                with open(image_path, "wb") as img_file:
-                    img_file.write(image_bytes)
-                
-                image_list.append({
-                    'page': page_num,
-                    'image_number': img_num,
-                    'path': str(image_path),
-                    'format': image_ext
-                })
-        
-        doc.close()
-        return image_list
+        with PDFSession(self.pdf_path) as session:
+            images, = session.traverse([ImageCollector(output_dir=output_dir)])
+        return images
     
-    def extract_all(self, output_dir='output'):
-        """Extract all information from PDF."""
+    def extract_all(self, output_dir='output', tables_file=None, text_method='pymupdf'):
+        """Extract all information from PDF.
+
+        Tables are written to CSV as they are found; tables_file (.parquet
+        or .arrow) additionally appends them all to one columnar file.
+        Text comes from the shared PyMuPDF pass unless text_method picks
+        another backend (or 'auto').
+        """
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
+        table_writers = [CSVTableWriter(output_path)]
+        if tables_file:
+            table_writers.append(ColumnarTableWriter(tables_file))
         
         results = {}
         
-        # Extract text (using PyMuPDF as default)
-        results['text'] = self.extract_text_pymupdf()
-        
-        # Extract metadata
-        results['metadata'] = self.extract_metadata()
-        
-        # Extract tables
-        tables = self.extract_tables_pdfplumber()
-        results['tables'] = []
-        for table in tables:
-            table_info = {
-                'page': table['page'],
-                'table_number': table['table_number']
-            }
-            # Save table to CSV
-            csv_name = f"table_page{table['page']}_num{table['table_number']}.csv"
-            csv_path = output_path / csv_name
-            table['dataframe'].to_csv(csv_path, index=False)
-            table_info['csv_path'] = str(csv_path)
-            results['tables'].append(table_info)
-        
-        # Extract images
-        results['images'] = self.extract_images_pymupdf(output_dir=output_path / 'images')
-        
-        # Save text output
+        # Parse the document once and run every collector in a single pass;
+        # page text is streamed straight to the text output file
+        print(f"Extracting text, metadata, tables and images from {self.pdf_path.name}...")
         text_path = output_path / f"{self.pdf_path.stem}_text.txt"
-        with open(text_path, 'w', encoding='utf-8') as f:
-            f.write(results['text'])
+        text_backend = self.text_backends(text_method)[0]
+        with PDFSession(self.pdf_path) as session, \
+                open(text_path, 'w', encoding='utf-8') as text_file:
+            collectors = [
+                MetadataCollector(),
+                TableCollector(page_cache=self._page_cache(f"tables:{table_backend()}"),
+                               sink=TableWriters(table_writers)),
+                ImageCollector(output_dir=output_path / 'images')
+            ]
+            if text_backend == 'pymupdf':
+                collectors.insert(0, TextCollector(sink=text_file,
+                                                   page_cache=self._page_cache('text:pymupdf')))
+                _, metadata, tables, images = session.traverse(collectors)
+            else:
+                metadata, tables, images = session.traverse(collectors)
+                self.write_text(text_file, text_method)
+        if self.cache is not None:
+            self.cache.commit()
+        results['metadata'] = metadata
+        results['tables'] = tables
+        results['images'] = images
         
         # Save metadata
         metadata_path = output_path / f"{self.pdf_path.stem}_metadata.json"
@@ -161,10 +238,12 @@ class PDFExtractor:
         summary = {
             'pdf_file': str(self.pdf_path),
             'text_output': str(text_path),
+            'text_backend': text_backend,
             'metadata_output': str(metadata_path),
             'tables_count': len(results['tables']),
             'tables': results['tables'],
             'images_count': len(results['images']),
+            'image_occurrences': sum(len(image['occurrences']) for image in results['images']),
             'images': results['images']
         }
         
@@ -184,16 +263,27 @@ class PDFExtractor:
 
 def main():
     """Main entry point for CLI usage."""
-    if len(sys.argv) < 2:
-        print("Usage: python pdf_extractor.py <path_to_pdf>")
-        print("Example: python pdf_extractor.py pdfs/sample.pdf")
-        sys.exit(1)
-    
-    pdf_path = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        description="Extract text, tables, images, and metadata from a PDF",
+        epilog="Example: python pdf_extractor.py pdfs/sample.pdf"
+    )
+    parser.add_argument('pdf', help="Path to the PDF file")
+    parser.add_argument('--output', default='output', help="Output directory")
+    parser.add_argument('--tables-file',
+                        help="Also append all tables to one .parquet or .arrow file")
+    parser.add_argument('--text-method', choices=TEXT_METHODS, default='pymupdf',
+                        help="Text backend; 'auto' benchmarks sample pages and picks the fastest")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-extract every page instead of reusing cached results")
+    args = parser.parse_args()
     
     try:
-        extractor = PDFExtractor(pdf_path)
-        extractor.extract_all()
+        if args.no_cache:
+            PDFExtractor(args.pdf).extract_all(args.output, args.tables_file, args.text_method)
+        else:
+            with ExtractionCache() as cache:
+                PDFExtractor(args.pdf, cache=cache).extract_all(args.output, args.tables_file,
+                                                                args.text_method)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -201,10 +291,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-
-
-
-
-
-
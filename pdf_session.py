@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Shared PDF document session.
+Parses a PDF once and sends every page through a set of collectors
+(text, tables, images, metadata) in a single traversal.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from lazy_imports import LazyModule
+
+fitz = LazyModule('fitz')  # PyMuPDF
+
+_table_backend = None
+
+
+def table_backend():
+    """'pymupdf' when PyMuPDF can find tables (>= 1.23), else 'pdfplumber'."""
+    global _table_backend
+    if _table_backend is None:
+        _table_backend = 'pymupdf' if hasattr(fitz.Page, 'find_tables') else 'pdfplumber'
+    return _table_backend
+
+
+class PDFSession:
+    """A single parsed PDF document shared by every extraction step."""
+
+    def __init__(self, pdf_path):
+        """Open the PDF once; pages are decoded on demand."""
+        self.pdf_path = Path(pdf_path)
+        if not self.pdf_path.exists():
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        self.doc = fitz.open(self.pdf_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release the underlying document."""
+        if self.doc is not None:
+            self.doc.close()
+            self.doc = None
+
+    @property
+    def page_count(self):
+        return self.doc.page_count
+
+    def page(self, page_index):
+        """Return the page at a 0-based index."""
+        return self.doc[page_index]
+
+    def page_text(self, page_index):
+        """Return the plain text of a page.
+
+        Not cached: extraction reads each page once, in a single pass, so
+        keeping the text would only grow memory with the page count.
+        """
+        return self.doc[page_index].get_text()
+
+    def traverse(self, collectors):
+        """Feed every page to every collector in one pass, return their results."""
+        for page_index in range(self.page_count):
+            page = self.doc[page_index]
+            for collector in collectors:
+                collector.collect(self, page_index + 1, page)
+        return [collector.finish(self) for collector in collectors]
+
+
+def page_marker(page_num):
+    """Separator written before each page of extracted text."""
+    return f"\n--- Page {page_num} ---\n"
+
+
+class TextCollector:
+    """Collect page text with the standard page markers.
+
+    With a sink (any object with .write, e.g. an open text file) each page
+    is written as soon as it is read and nothing is kept in memory.
+    An optional PageCache supplies previously extracted page text.
+    """
+
+    def __init__(self, sink=None, page_cache=None):
+        self.sink = sink
+        self.page_cache = page_cache
+        self.parts = []
+
+    def _text(self, page_num, page):
+        if self.page_cache is None:
+            return page.get_text()
+        text = self.page_cache.get(page_num)
+        if text is None:
+            text = page.get_text()
+            self.page_cache.put(page_num, text)
+        return text
+
+    def collect(self, session, page_num, page):
+        page_text = page_marker(page_num) + self._text(page_num, page)
+        if self.sink is not None:
+            self.sink.write(page_text)
+        else:
+            self.parts.append(page_text)
+
+    def finish(self, session):
+        if self.sink is not None:
+            return None
+        return "".join(self.parts)
+
+
+class MetadataCollector:
+    """Collect document metadata (needs no per-page work)."""
+
+    def collect(self, session, page_num, page):
+        pass
+
+    def finish(self, session):
+        metadata = dict(session.doc.metadata or {})
+        metadata['page_count'] = session.page_count
+        return metadata
+
+
+class TableCollector:
+    """Collect raw table rows per page.
+
+    Uses PyMuPDF's table finder on the already-open page when available,
+    otherwise falls back to a single pdfplumber handle for the whole run.
+    An optional PageCache supplies previously extracted rows. With a sink
+    (e.g. a table_writers writer) each table is written as soon as it is
+    found and only its summary info is kept.
+    """
+
+    def __init__(self, page_cache=None, sink=None):
+        self.page_cache = page_cache
+        self.sink = sink
+        self.tables = []
+        self._plumber = None
+
+    def _page_tables(self, session, page_num, page):
+        if self.page_cache is None:
+            return self._find_tables(session, page_num, page)
+        tables = self.page_cache.get(page_num)
+        if tables is None:
+            tables = self._find_tables(session, page_num, page)
+            self.page_cache.put(page_num, tables)
+        return tables
+
+    def _find_tables(self, session, page_num, page):
+        if table_backend() == 'pymupdf':
+            return [table.extract() for table in page.find_tables().tables]
+        if self._plumber is None:
+            import pdfplumber
+            self._plumber = pdfplumber.open(session.pdf_path)
+        return self._plumber.pages[page_num - 1].extract_tables()
+
+    def collect(self, session, page_num, page):
+        tables = self._page_tables(session, page_num, page)
+        for table_num, rows in enumerate(tables, 1):
+            if not rows:
+                continue
+            table = {'page': page_num, 'table_number': table_num}
+            if self.sink is not None:
+                table.update(self.sink.write_table(page_num, table_num, rows))
+            else:
+                table['rows'] = rows
+            self.tables.append(table)
+
+    def finish(self, session):
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+        if self.sink is not None:
+            self.sink.close()
+        return self.tables
+
+
+class ImageCollector:
+    """Collect embedded images and write each distinct one to disk once.
+
+    Each xref is decoded only the first time it appears; files are named by
+    content hash, so the same logo stored under several xrefs is written
+    once too. Every image records the pages it appears on. File writes run
+    on a small thread pool while the traversal continues.
+    """
+
+    def __init__(self, output_dir='output/images', max_workers=4):
+        self.output_path = Path(output_dir)
+        self.output_path.mkdir(parents=True, exist_ok=True)
+        self.images = {}  # sha256 -> image info
+        self._xref_digests = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._writes = []
+
+    def _write(self, image_path, image_bytes):
+        with open(image_path, "wb") as img_file:
+            img_file.write(image_bytes)
+
+    def collect(self, session, page_num, page):
+        for img_num, img in enumerate(page.get_images(), 1):
+            xref = img[0]
+            digest = self._xref_digests.get(xref)
+            if digest is None:
+                base_image = session.doc.extract_image(xref)
+                image_bytes = base_image["image"]
+                image_ext = base_image["ext"]
+                digest = hashlib.sha256(image_bytes).hexdigest()
+                self._xref_digests[xref] = digest
+
+                if digest not in self.images:
+                    image_path = self.output_path / f"{digest[:16]}.{image_ext}"
+                    self._writes.append(self._pool.submit(self._write, image_path, image_bytes))
+                    self.images[digest] = {
+                        'sha256': digest,
+                        'path': str(image_path),
+                        'format': image_ext,
+                        'xrefs': [],
+                        'occurrences': []
+                    }
+                self.images[digest]['xrefs'].append(xref)
+
+            self.images[digest]['occurrences'].append({'page': page_num, 'image_number': img_num})
+
+    def finish(self, session):
+        self._pool.shutdown(wait=True)
+        for write in self._writes:
+            write.result()  # re-raise any write error
+        return list(self.images.values())
+
+
+def page_chunks(page_count, workers, chunks_per_worker=4):
+    """Split range(page_count) into contiguous (start, stop) chunks.
+
+    A few chunks per worker keeps the pool busy when some pages are much
+    heavier than others.
+    """
+    if page_count <= 0:
+        return []
+    chunk_count = max(1, min(page_count, workers * chunks_per_worker))
+    chunk_size = -(-page_count // chunk_count)
+    return [(start, min(start + chunk_size, page_count))
+            for start in range(0, page_count, chunk_size)]
+
+
+def resolve_workers(workers):
+    """Map a worker count option to a real count (0 or None means all cores)."""
+    if not workers:
+        return os.cpu_count() or 1
+    return workers
+
+
+def iter_pages_parallel(chunk_fn, pdf_path, workers=None, page_count=None):
+    """Run chunk_fn(pdf_path, start, stop) over page chunks in a process pool.
+
+    chunk_fn must be a module-level function that opens its own document
+    handle and returns one result per page. Results are yielded in page
+    order as soon as each chunk (and every chunk before it) is done.
+    """
+    if page_count is None:
+        with fitz.open(pdf_path) as doc:
+            page_count = doc.page_count
+    workers = resolve_workers(workers)
+    chunks = page_chunks(page_count, workers)
+    if workers <= 1 or len(chunks) <= 1:
+        for start, stop in chunks:
+            yield from chunk_fn(str(pdf_path), start, stop)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        futures = [pool.submit(chunk_fn, str(pdf_path), start, stop)
+                   for start, stop in chunks]
+        for future in futures:
+            yield from future.result()
+
+
+def map_pages_parallel(chunk_fn, pdf_path, workers=None, page_count=None):
+    """List form of iter_pages_parallel."""
+    return list(iter_pages_parallel(chunk_fn, pdf_path, workers, page_count))
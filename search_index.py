@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Inverted-index station search.
+Tokenizes station name, city, state, highway and NaviGo ID once and maps
+every token to the stations holding it. A query is a few dictionary and
+bisect lookups over the sorted vocabulary instead of substring checks on
+every station, and matches only at word starts, so "ca" finds California
+but not "Cartersville". The index can be exported as JSON next to the
+extracted data so clients load it instead of rebuilding it.
+"""
+
+import argparse
+import json
+import re
+from bisect import bisect_left
+
+from corridor_index import parse_exit_info, parse_highway
+from station_table import iter_regions
+
+INDEX_VERSION = 1
+
+# Query terms shorter than this only match whole tokens (mirrors
+# MIN_SEARCH_QUERY_LENGTH in src/config/constants.ts)
+MIN_PREFIX_LENGTH = 3
+
+# Field weights: a hit in the station name counts more than one in the city
+FIELD_WEIGHTS = {'navigo_id': 8, 'name': 4, 'highway': 3, 'city': 2, 'state': 2}
+
+# An exact token match scores this many times a prefix match
+EXACT_BOOST = 2
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+CITY_STATE_PATTERN = re.compile(r'([^,]*),\s*([A-Z]{2})\b')
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def document_id(region, station, index):
+    """Same ids as the frontend: STATE-number, or COVENANT-index for terminals."""
+    if region == 'COVENANT_TERMINALS':
+        return f"COVENANT-{index}"
+    return f"{region}-{station.get('number')}"
+
+
+def station_tokens(region, station):
+    """{token: weight} for one station or terminal."""
+    tokens = {}
+
+    def add(field, values):
+        for token in values:
+            tokens[token] = max(tokens.get(token, 0), FIELD_WEIGHTS[field])
+
+    add('name', tokenize(station.get('name')))
+    location = station.get('city_state_zip') or station.get('address') or ''
+    match = CITY_STATE_PATTERN.search(location)
+    if match:
+        # The city is the last line before the comma (addresses may precede it)
+        add('city', tokenize(match.group(1).split('\n')[-1]))
+        add('state', [match.group(2).lower()])
+    if region != 'COVENANT_TERMINALS':
+        add('state', tokenize(region))
+    add('highway', {highway.lower() for highway, *_ in parse_exit_info(station.get('exit_info'))})
+    if station.get('navigo_id'):
+        add('navigo_id', [station['navigo_id'].lower()])
+    return tokens
+
+
+class SearchIndex:
+    """Token -> [(document, weight)] postings over a sorted vocabulary."""
+
+    def __init__(self, documents, postings):
+        self.documents = documents  # document ids, in data order
+        self.postings = postings
+        self.vocabulary = sorted(postings)
+
+    @classmethod
+    def build(cls, data):
+        """Index a BackendData-shaped dict or a StationTable."""
+        documents = []
+        postings = {}
+        for region, info in iter_regions(data):
+            records = info['terminals'] if region == 'COVENANT_TERMINALS' else info['fuel_stations']
+            for index, station in enumerate(records):
+                doc = len(documents)
+                documents.append(document_id(region, station, index))
+                for token, weight in station_tokens(region, station).items():
+                    postings.setdefault(token, []).append((doc, weight))
+        return cls(documents, postings)
+
+    def _query_terms(self, query):
+        """Query terms; highways ("I 85") and NaviGo IDs stay whole."""
+        highway = parse_highway(query)
+        if highway:
+            return [highway.lower()]
+        terms = []
+        for word in query.lower().split():
+            highway = parse_highway(word)
+            if highway:
+                terms.append(highway.lower())
+            elif word in self.postings:
+                terms.append(word)
+            else:
+                terms.extend(tokenize(word))
+        return terms
+
+    def _term_scores(self, term):
+        """{document: score} for one query term (exact and prefix matches)."""
+        scores = {}
+        for doc, weight in self.postings.get(term, []):
+            scores[doc] = weight * EXACT_BOOST
+        if len(term) < MIN_PREFIX_LENGTH:
+            return scores
+        position = bisect_left(self.vocabulary, term)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(term):
+            token = self.vocabulary[position]
+            position += 1
+            if token == term:
+                continue
+            for doc, weight in self.postings[token]:
+                scores[doc] = max(scores.get(doc, 0), weight)
+        return scores
+
+    def search(self, query, limit=None):
+        """Document ids matching every query term, best first."""
+        totals = None
+        for term in self._query_terms(query):
+            scores = self._term_scores(term)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {doc: totals[doc] + score for doc, score in scores.items() if doc in totals}
+            if not totals:
+                return []
+        if not totals:
+            return []
+        ranked = sorted(totals, key=lambda doc: (-totals[doc], doc))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self.documents[doc] for doc in ranked]
+
+    def to_dict(self):
+        """Serialize for export: postings are flat [doc, weight, doc, weight, ...] lists."""
+        return {
+            'version': INDEX_VERSION,
+            'documents': self.documents,
+            'fieldWeights': FIELD_WEIGHTS,
+            'postings': {token: [value for posting in self.postings[token] for value in posting]
+                         for token in self.vocabulary}
+        }
+
+    @classmethod
+    def from_dict(cls, exported):
+        if exported.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version: {exported.get('version')}")
+        postings = {token: list(zip(flat[0::2], flat[1::2]))
+                    for token, flat in exported['postings'].items()}
+        return cls(exported['documents'], postings)
+
+
+def write_search_index(data, path):
+    """Build the search index for data and write it as JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(SearchIndex.build(data).to_dict(), f, separators=(',', ':'))
+
+
+def main():
+    """Export a search index, or run a query against extracted data."""
+    parser = argparse.ArgumentParser(description="Fuel station search index")
+    parser.add_argument('data', help="Extracted station JSON or an exported index")
+    parser.add_argument('query', nargs='?', help="Search query")
+    parser.add_argument('--export', metavar='PATH', help="Write the prebuilt index to PATH")
+    parser.add_argument('--limit', type=int, default=20, help="Maximum results (default: 20)")
+    args = parser.parse_args()
+
+    with open(args.data, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    index = SearchIndex.from_dict(data) if 'postings' in data else SearchIndex.build(data)
+
+    if args.export:
+        with open(args.export, 'w', encoding='utf-8') as f:
+            json.dump(index.to_dict(), f, separators=(',', ':'))
+        print(f"🔎 Search index saved to: {args.export} ({len(index.vocabulary)} tokens)")
+    if args.query:
+        for document in index.search(args.query, args.limit):
+            print(f"  {document}")
+
+
+if __name__ == "__main__":
+    main()
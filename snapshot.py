@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Binary snapshot of extracted fuel station data.
+A fixed little-endian layout with a shared string table, so a reader can
+memory-map the file and decode only the state or station it is asked
+for instead of parsing the whole JSON document.
+
+Layout:
+    header      magic, version, counts and section offsets
+    strings     (offset, length) per string id, then the UTF-8 blob
+    regions     (name id, first station, station count, terminals id)
+    stations    fixed-size records, grouped by region, one id per field
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+from station_table import StationTable, STATION_FIELDS, TEXT_FIELDS
+
+MAGIC = b'FBSNAP\x00\x01'
+VERSION = 1
+NONE = 0xFFFFFFFF  # string id / int for a missing value
+
+# magic, version, region count, station count, string count,
+# strings offset, regions offset, stations offset
+HEADER = struct.Struct('<8sIIII3Q')
+STRING_ENTRY = struct.Struct('<II')
+REGION_ENTRY = struct.Struct('<IIII')
+# page, number, state, type, name, address, city_state_zip, exit_info,
+# phone, fax, navigo_id, site_type, extras (JSON)
+STATION_RECORD = struct.Struct('<ii11I')
+STRING_FIELDS = ('state', 'type') + TEXT_FIELDS + ('site_type',)
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def id(self, value):
+        if value is None:
+            return NONE
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.ids[value] = string_id
+            self.strings.append(value)
+        return string_id
+
+
+def write_snapshot(data, path):
+    """Write a BackendData dict or StationTable to a binary snapshot."""
+    table = data if isinstance(data, StationTable) else StationTable.from_dict(data)
+    strings = _StringTable()
+
+    # Group station rows by region, keeping their order within a region
+    rows_by_region = {region: [] for region in table.regions}
+    for row in range(len(table)):
+        rows_by_region[table.region_of(row)].append(row)
+
+    regions = bytearray()
+    stations = bytearray()
+    station_count = 0
+    for region in table.regions:
+        terminals = table.terminals[region]
+        regions += REGION_ENTRY.pack(
+            strings.id(region), station_count, len(rows_by_region[region]),
+            strings.id(json.dumps(terminals, ensure_ascii=False)) if terminals else NONE
+        )
+        for row in rows_by_region[region]:
+            station = table.station(row)
+            # Page and number values the int columns cannot hold travel with the extras
+            extras = table.extras.get(row)
+            stations += STATION_RECORD.pack(
+                table.columns['page'][row],
+                table.columns['number'][row],
+                *(strings.id(station.get(field)) for field in STRING_FIELDS),
+                strings.id(json.dumps(extras, ensure_ascii=False)) if extras else NONE
+            )
+            station_count += 1
+
+    blob = bytearray()
+    entries = bytearray()
+    for value in strings.strings:
+        encoded = value.encode('utf-8')
+        entries += STRING_ENTRY.pack(len(blob), len(encoded))
+        blob += encoded
+
+    strings_offset = HEADER.size
+    regions_offset = strings_offset + len(entries) + len(blob)
+    stations_offset = regions_offset + len(regions)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(table.regions), station_count,
+                            len(strings.strings), strings_offset, regions_offset,
+                            stations_offset))
+        f.write(entries)
+        f.write(blob)
+        f.write(regions)
+        f.write(stations)
+
+
+class Snapshot:
+    """Memory-mapped reader; decodes strings and records on demand."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, region_count, self.station_count, self.string_count,
+         self._strings_offset, regions_offset, self._stations_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a fuel station snapshot (v{VERSION}): {path}")
+        self._blob_offset = self._strings_offset + self.string_count * STRING_ENTRY.size
+        self._cache = {}
+
+        # The region directory is tiny, so it is read up front
+        self._regions = {}
+        for index in range(region_count):
+            name_id, first, count, terminals_id = REGION_ENTRY.unpack_from(
+                self._map, regions_offset + index * REGION_ENTRY.size)
+            self._regions[self._string(name_id)] = (first, count, terminals_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _string(self, string_id):
+        if string_id == NONE:
+            return None
+        value = self._cache.get(string_id)
+        if value is None:
+            offset, length = STRING_ENTRY.unpack_from(
+                self._map, self._strings_offset + string_id * STRING_ENTRY.size)
+            start = self._blob_offset + offset
+            value = self._map[start:start + length].decode('utf-8')
+            self._cache[string_id] = value
+        return value
+
+    def _record(self, index):
+        values = STATION_RECORD.unpack_from(self._map, self._stations_offset + index * STATION_RECORD.size)
+        page, number = values[0], values[1]
+        fields = dict(zip(STRING_FIELDS, values[2:-1]))
+        station = {}
+        if page != -1:
+            station['page'] = page
+        for field in STATION_FIELDS:
+            if field == 'page':
+                continue
+            if field == 'number':
+                if number != -1:
+                    station['number'] = f"{number:03d}"
+                continue
+            value = self._string(fields[field])
+            if value is not None:
+                station[field] = value
+        if values[-1] != NONE:
+            station.update(json.loads(self._string(values[-1])))
+        return station
+
+    def regions(self):
+        return list(self._regions)
+
+    def station_count_for(self, region):
+        return self._regions[region][1]
+
+    def station(self, region, index):
+        """Decode one station of a region."""
+        first, count, _ = self._regions[region]
+        if not 0 <= index < count:
+            raise IndexError(f"{region} has {count} stations")
+        return self._record(first + index)
+
+    def stations(self, region):
+        """Decode every station of one region."""
+        first, count, _ = self._regions[region]
+        return [self._record(index) for index in range(first, first + count)]
+
+    def terminals(self, region):
+        terminals_id = self._regions[region][2]
+        return json.loads(self._string(terminals_id)) if terminals_id != NONE else []
+
+    def to_dict(self):
+        """Decode everything back to the BackendData JSON shape."""
+        return {region: {'terminals': self.terminals(region), 'fuel_stations': self.stations(region)}
+                for region in self._regions}
+
+
+def main():
+    """Convert JSON to a snapshot, or query a snapshot by state."""
+    parser = argparse.ArgumentParser(description="Fuel station binary snapshots")
+    parser.add_argument('source', help="fuel_stations_data.json to convert, or a snapshot to read")
+    parser.add_argument('output', nargs='?', help="Snapshot file to write (convert mode)")
+    parser.add_argument('--state', help="Print the stations of one state from a snapshot")
+    args = parser.parse_args()
+
+    if args.output:
+        with open(args.source, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        write_snapshot(data, args.output)
+        print(f"📦 Snapshot saved to: {args.output}")
+        return
+
+    with Snapshot(args.source) as snapshot:
+        if args.state:
+            if args.state not in snapshot.regions():
+                print(f"Error: no state {args.state!r} in {args.source}")
+                sys.exit(1)
+            json.dump(snapshot.stations(args.state), sys.stdout, indent=2, ensure_ascii=False)
+            print()
+        else:
+            for region in snapshot.regions():
+                print(f"  {region}: {snapshot.station_count_for(region)} stations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Compiled patterns and field specs shared by the station and terminal
+parsers of the PDF and HTML extractors (see field_specs.py).
+"""
+
+import re
+
+from field_specs import FieldSpec, FieldMatcher
+
+# Station entries: #123 TA Location or #123 Petro Location
+STATION_PATTERN = re.compile(r'#([0-9]{3})\s+(TA|Petro)\s+([^\n]+)')
+
+# City/state/zip format: "City, ST ZIP" (has comma and 2-letter state)
+CITY_STATE_ZIP_PATTERN = re.compile(r',\s*[A-Z]{2}\s+[0-9]{5}')
+
+PHONE = r'\([0-9]{3}\)\s*[0-9]{3}-[0-9]{4}'
+
+# Per-station fields: patterns for fuel book page text, labels for the
+# review HTML's detail lines. Each pattern starts with a literal so the
+# regex engine can skip ahead on a first-character set; the site type
+# markers have no value and record ''.
+STATION_FIELDS = (
+    FieldSpec('phone', r'Ph:\s*(?P<value>' + PHONE + ')', label='Phone'),
+    FieldSpec('fax', r'Fx:\s*(?P<value>' + PHONE + ')', label='Fax'),
+    FieldSpec('navigo_id', r'NaviGo:\s*(?P<value>[A-Z0-9-]+)', label='NaviGo ID'),
+    FieldSpec('address', label='Address'),
+    FieldSpec('location', label='Location'),
+    FieldSpec('exit', label='Exit'),
+    FieldSpec('exclusive', '★'),
+    FieldSpec('dot', '●'),
+    FieldSpec('primary', 'Primary'),
+    FieldSpec('limited', 'Limited'),
+)
+STATION_MATCHER = FieldMatcher(STATION_FIELDS)
+
+
+def is_city_state_zip(text):
+    return CITY_STATE_ZIP_PATTERN.search(text) is not None
+
+
+def collect_fields(text, fields, pos=0, endpos=None):
+    """Record the first hit of each station field in text[pos:endpos]."""
+    return STATION_MATCHER.scan_text(text, fields, pos, endpos)
+
+
+def site_type(fields):
+    """Site type from the markers collected for one station."""
+    if 'exclusive' in fields:
+        return 'Exclusive'
+    if 'dot' in fields:
+        # Check if it says "Primary" or "Limited" nearby
+        if 'primary' in fields:
+            return 'Primary'
+        if 'limited' in fields:
+            return 'Limited'
+        return 'Primary'  # Default for ●
+    return 'Unknown'
+
+
+def amenity_list(block):
+    """Items of an AMENITIES: block ("- Showers" lines) as a list."""
+    return [line.strip().replace('- ', '') for line in block.split('\n')
+            if line.strip().startswith('-')] or None
+
+
+# Covenant terminal fields. SHOWERS: and PARKING SPOTS: values stay on
+# their label's line; other values may sit on the line after their label
+# but never swallow the next label (the "(?!:)" guards), so an empty
+# "SHOP:" leaves AMENITIES: intact.
+TERMINAL_FIELDS = (
+    FieldSpec('name', r'^[ \t]*(?P<value>[^\n]*?Covenant Logistics:[^\n]*?)[ \t]*$'),
+    FieldSpec('address', r'Address:[ \t]*(?P<value>[^\n]*?)[ \t]*$', label='Address'),
+    FieldSpec('phone', r'Phone:\s*(?P<value>' + PHONE + ')', label='Phone'),
+    FieldSpec('navigo_id', r'(?i:NAVIGO ID:)\s*(?P<value>[A-Z0-9-]+)', label='NaviGo ID'),
+    FieldSpec('amenities', r'AMENITIES:[^\n]*\n(?P<value>(?:[ \t]*(?:-[^\n]*)?\n)*(?:[ \t]*-[^\n]*)?)',
+              normalize=amenity_list),
+    FieldSpec('showers', r'SHOWERS:(?:[ \t]*(?P<value>[A-Z0-9]+)\b(?!:))?', default='NO'),
+    FieldSpec('parking', r'PARKING SPOTS:(?:[ \t]*(?P<value>[0-9]+))?', default='0'),
+    FieldSpec('shop', r'SHOP:(?:\s*(?P<value>[A-Z]+)\b(?!:))?', default='NO'),
+    # Unlabelled street address, e.g. "400 Birmingham Hwy, Chattanooga, TN 37419",
+    # or the street and "City, ST ZIP" on two lines. At most one line break:
+    # inside the single finditer a match that ran on would swallow every
+    # field after it.
+    FieldSpec('address', r'(?P<value>[0-9]+[ \t]+[^,\n]+(?:,[^,\n]+|\n[^,\n]+)?,[ \t]*[A-Z]{2}[ \t]+[0-9]{5})'),
+)
+TERMINAL_MATCHER = FieldMatcher(TERMINAL_FIELDS)
+
+# Output order of terminal fields
+TERMINAL_FIELD_ORDER = ('name', 'address', 'phone', 'navigo_id', 'amenities', 'showers', 'parking', 'shop')
+
+
+def terminal_fields(text=None, lines=None):
+    """Covenant terminal fields from page text or "Label: value" lines,
+    in TERMINAL_FIELD_ORDER."""
+    if lines is not None:
+        found = TERMINAL_MATCHER.scan_labels(lines)
+    else:
+        found = TERMINAL_MATCHER.scan_text(text)
+    return {field: found[field] for field in TERMINAL_FIELD_ORDER if field in found}
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Compact columnar station store.
+Keeps every station field in its own column instead of one dict per
+station: page and number are machine ints, repeated labels (state, brand,
+site type) are stored as small integer codes into a shared category list,
+and free-text fields are interned strings. to_dict() rebuilds the usual
+{state: {'terminals': [...], 'fuel_stations': [...]}} JSON shape;
+dump_json() writes that JSON one region at a time instead.
+"""
+
+import json
+import sys
+from array import array
+
+# Field order of a serialized station (matches the PDF extractor output)
+STATION_FIELDS = (
+    'page', 'state', 'number', 'type', 'name', 'address', 'city_state_zip',
+    'exit_info', 'phone', 'fax', 'navigo_id', 'site_type'
+)
+INT_FIELDS = ('page', 'number')
+CATEGORY_FIELDS = ('state', 'type', 'site_type')
+TEXT_FIELDS = ('name', 'address', 'city_state_zip', 'exit_info', 'phone', 'fax', 'navigo_id')
+
+MISSING = -1
+INT_RANGE = range(0, 2 ** 31)
+
+
+def _int_code(field, value):
+    """Column value of a page or station number, or None when it has no
+    exact int form (e.g. number "12A"); such values are kept as extras."""
+    if field == 'page':
+        return value if type(value) is int and value in INT_RANGE else None
+    if isinstance(value, str) and value.isdigit() and int(value) in INT_RANGE:
+        number = int(value)
+        return number if f"{number:03d}" == value else None
+    return None
+
+
+class Categories:
+    """Category list shared by the categorical columns (value <-> code)."""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def code(self, value):
+        if value is None:
+            return MISSING
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(sys.intern(value))
+            self.codes[value] = code
+        return code
+
+    def value(self, code):
+        return None if code == MISSING else self.values[code]
+
+
+class StationTable:
+    """Stations of every region in parallel columns, plus per-region terminals."""
+
+    def __init__(self):
+        self.categories = Categories()
+        self.regions = []  # region names in first-seen order
+        self.terminals = {}  # region -> [terminal dict]
+        self.region = array('h')
+        self.columns = {field: array('i') for field in INT_FIELDS}
+        self.columns.update({field: array('h') for field in CATEGORY_FIELDS})
+        self.columns.update({field: [] for field in TEXT_FIELDS})
+        # row -> {field: value} for fields outside STATION_FIELDS and page or
+        # number values the int columns cannot hold as written
+        self.extras = {}
+
+    def __len__(self):
+        return len(self.region)
+
+    def add_region(self, region):
+        """Register a region (keeps it in the output even with no stations)."""
+        if region not in self.terminals:
+            self.regions.append(region)
+            self.terminals[region] = []
+
+    def add_terminal(self, region, terminal):
+        self.add_region(region)
+        self.terminals[region].append(terminal)
+
+    def append(self, region, station):
+        """Add one station dict under a region."""
+        self.add_region(region)
+        self.region.append(self.categories.code(region))
+        extra = {key: value for key, value in station.items() if key not in STATION_FIELDS}
+        for field in INT_FIELDS:
+            value = station.get(field)
+            code = _int_code(field, value) if value is not None else MISSING
+            if code is None:
+                extra[field] = value
+                code = MISSING
+            self.columns[field].append(code)
+        for field in CATEGORY_FIELDS:
+            self.columns[field].append(self.categories.code(station.get(field)))
+        for field in TEXT_FIELDS:
+            value = station.get(field)
+            self.columns[field].append(sys.intern(value) if value is not None else None)
+        if extra:
+            self.extras[len(self.region) - 1] = extra
+
+    def extend(self, region, stations):
+        for station in stations:
+            self.append(region, station)
+
+    def region_of(self, row):
+        return self.categories.value(self.region[row])
+
+    def station(self, row):
+        """Rebuild the station dict at a row."""
+        columns = self.columns
+        station = {}
+        page = self._int_value('page', row)
+        if page is not None:
+            station['page'] = page
+        state = self.categories.value(columns['state'][row])
+        if state is not None:
+            station['state'] = state
+        number = self._int_value('number', row)
+        if number is not None:
+            station['number'] = number
+        brand = self.categories.value(columns['type'][row])
+        if brand is not None:
+            station['type'] = brand
+        for field in TEXT_FIELDS:
+            value = columns[field][row]
+            if value is not None:
+                station[field] = value
+        site_type = self.categories.value(columns['site_type'][row])
+        if site_type is not None:
+            station['site_type'] = site_type
+        if row in self.extras:
+            station.update(self.extras[row])
+        return station
+
+    def _int_value(self, field, row):
+        """Page or station number at a row as written (None where missing)."""
+        value = self.columns[field][row]
+        if value == MISSING:
+            return self.extras[row].get(field) if row in self.extras else None
+        return f"{value:03d}" if field == 'number' else value
+
+    def iter_stations(self, region=None):
+        """Yield (region, station dict), optionally for one region only."""
+        code = self.categories.codes.get(region) if region is not None else None
+        for row in range(len(self.region)):
+            if region is None or self.region[row] == code:
+                yield self.region_of(row), self.station(row)
+
+    def rows_by_region(self):
+        """Row numbers of each region's stations, in row order."""
+        rows = {region: array('i') for region in self.regions}
+        for row in range(len(self.region)):
+            rows[self.region_of(row)].append(row)
+        return rows
+
+    def column(self, field, rows):
+        """Values of one station field at rows (None where missing)."""
+        values = self.columns[field]
+        if field in CATEGORY_FIELDS:
+            return [self.categories.value(values[row]) for row in rows]
+        if field in INT_FIELDS:
+            return [self._int_value(field, row) for row in rows]
+        return [values[row] for row in rows]
+
+    def iter_regions(self):
+        """Yield (region, {'terminals', 'fuel_stations'}), building one region at a time."""
+        rows = self.rows_by_region()
+        for region in self.regions:
+            yield region, {'terminals': list(self.terminals[region]),
+                           'fuel_stations': [self.station(row) for row in rows[region]]}
+
+    def to_dict(self):
+        """Serialize to the BackendData JSON shape."""
+        return dict(self.iter_regions())
+
+    @classmethod
+    def from_dict(cls, data):
+        """Load a BackendData-shaped dict."""
+        table = cls()
+        for region, info in data.items():
+            table.add_region(region)
+            for terminal in info.get('terminals', []):
+                table.add_terminal(region, terminal)
+            table.extend(region, info.get('fuel_stations', []))
+        return table
+
+
+def iter_regions(data):
+    """(region, info) pairs of a BackendData dict or a StationTable."""
+    return data.iter_regions() if isinstance(data, StationTable) else iter(data.items())
+
+
+def region_counts(data):
+    """(region, terminal count, station count) of a BackendData dict or a StationTable."""
+    if isinstance(data, StationTable):
+        rows = data.rows_by_region()
+        return [(region, len(data.terminals[region]), len(rows[region])) for region in data.regions]
+    return [(region, len(info['terminals']), len(info['fuel_stations'])) for region, info in data.items()]
+
+
+def dump_json(data, f):
+    """Write data as json.dump(data, f, indent=2, ensure_ascii=False) would.
+
+    A StationTable is written region by region, so the full dict of
+    stations never exists at once.
+    """
+    f.write('{')
+    separator = '\n  '
+    for region, info in iter_regions(data):
+        f.write(separator + json.dumps(region, ensure_ascii=False) + ': ')
+        f.write(json.dumps(info, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+        separator = ',\n  '
+    f.write('}' if separator == '\n  ' else '\n}')
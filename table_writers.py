@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Streaming table writers.
+Each table is written the moment it is found, so extraction memory stays
+bounded no matter how many tables a document holds.
+"""
+
+import csv
+from itertools import zip_longest
+from pathlib import Path
+
+
+class CSVTableWriter:
+    """Write every table to its own CSV file (first row is the header)."""
+
+    def __init__(self, output_dir):
+        self.output_path = Path(output_dir)
+        self.output_path.mkdir(parents=True, exist_ok=True)
+
+    def write_table(self, page_num, table_number, rows):
+        csv_name = f"table_page{page_num}_num{table_number}.csv"
+        csv_path = self.output_path / csv_name
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerows(rows)
+        return {'csv_path': str(csv_path)}
+
+    def close(self):
+        pass
+
+
+class ColumnarTableWriter:
+    """Append every table to one Parquet (.parquet) or Arrow (.arrow) file.
+
+    Tables have different shapes, so cells are stored in long form with
+    page, table_number, row, column_index, column and value columns.
+    column is the header text, which may be blank, None or repeated;
+    column_index tells the columns apart. Requires pyarrow.
+    """
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Columnar table output needs pyarrow: pip install pyarrow")
+        self.pa = pa
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.schema = pa.schema([
+            ('page', pa.int32()),
+            ('table_number', pa.int32()),
+            ('row', pa.int32()),
+            ('column_index', pa.int32()),
+            ('column', pa.string()),
+            ('value', pa.string()),
+        ])
+        if self.path.suffix == '.parquet':
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(self.path, self.schema)
+        else:
+            self.writer = pa.ipc.new_file(str(self.path), self.schema)
+
+    def write_table(self, page_num, table_number, rows):
+        header = rows[0]
+        columns = {'page': [], 'table_number': [], 'row': [], 'column_index': [], 'column': [], 'value': []}
+        for row_num, row in enumerate(rows[1:], 1):
+            # Cells past the header (or a short row) are kept with a None partner
+            for column_index, (column, value) in enumerate(zip_longest(header, row)):
+                columns['page'].append(page_num)
+                columns['table_number'].append(table_number)
+                columns['row'].append(row_num)
+                columns['column_index'].append(column_index)
+                columns['column'].append(column)
+                columns['value'].append(value)
+        self.writer.write_table(self.pa.table(columns, schema=self.schema))
+        return {'columnar_path': str(self.path)}
+
+    def close(self):
+        self.writer.close()
+
+
+class TableWriters:
+    """Fan one table out to several writers, merging their info dicts."""
+
+    def __init__(self, writers):
+        self.writers = writers
+
+    def write_table(self, page_num, table_number, rows):
+        info = {}
+        for writer in self.writers:
+            info.update(writer.write_table(page_num, table_number, rows))
+        return info
+
+    def close(self):
+        for writer in self.writers:
+            writer.close()
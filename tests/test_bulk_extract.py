@@ -0,0 +1,10 @@
+from bulk_extract import source_names
+
+
+def test_same_named_files_keep_their_directories(tmp_path):
+    paths = [tmp_path / 'books' / '2023' / 'fuel.pdf', tmp_path / 'books' / '2024' / 'fuel.pdf']
+    assert source_names(paths) == ['2023/fuel.pdf', '2024/fuel.pdf']
+
+
+def test_single_file_is_tagged_by_name(tmp_path):
+    assert source_names([tmp_path / 'fuel.pdf']) == ['fuel.pdf']
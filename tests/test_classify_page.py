@@ -0,0 +1,43 @@
+from extract_fuel_data import (
+    PAGE_KEY, PAGE_STATE, PAGE_STATIONS, PAGE_TERMINAL, classify_page, merge_page_results, scan_page
+)
+
+STATION = "#102 TA Bar\n12 Main St\nBar, TX 75001\nI-20, Exit 1\nPh: (512) 555-0102\nNaviGo: CVEN-TA102\n★\n"
+
+
+def test_legend_page_with_stations_is_parsed():
+    text = "SITE TYPE KEY\n★ Exclusive ● Primary ● Limited\n" + STATION
+    assert classify_page(text) == (PAGE_STATIONS, None)
+    pages = [scan_page("TEXAS\nSITE TYPE KEY\n", 1), scan_page(text, 2)]
+    assert [station['number'] for station in merge_page_results(pages)['TEXAS']['fuel_stations']] == ['102']
+
+
+def test_legend_page_without_stations():
+    assert classify_page("SITE TYPE KEY\n★ Exclusive ● Primary ● Limited\n") == (PAGE_KEY, None)
+
+
+def test_state_page():
+    assert classify_page("TEXAS\nSITE TYPE KEY\n" + STATION) == (PAGE_STATE, 'TEXAS')
+
+
+def test_terminal_page_keeps_its_stations():
+    text = "Covenant Logistics: Dallas, TX\nNAVIGO ID: CVEN-T01\n" + STATION
+    result = scan_page(text, 5)
+    assert result['kind'] == PAGE_TERMINAL
+    assert result['terminal']['navigo_id'] == 'CVEN-T01'
+    assert [station['number'] for station in result['stations']] == ['102']
+
+
+def test_terminal_page_with_region_header():
+    text = "OHIO\nSITE TYPE KEY\nCovenant Logistics: Columbus, OH\nNAVIGO ID: CVEN-COL\n" + STATION
+    assert classify_page(text) == (PAGE_TERMINAL, 'OHIO')
+    pages = [scan_page("TEXAS\nSITE TYPE KEY\n", 1), scan_page(text, 2)]
+    data = merge_page_results(pages)
+    assert data['TEXAS']['fuel_stations'] == []
+    assert [station['number'] for station in data['OHIO']['fuel_stations']] == ['102']
+
+
+def test_terminal_page_without_terminal_fields():
+    text = "Covenant Logistics: Chattanooga, TN\n400 Birmingham Hwy, Chattanooga, TN 37419\n"
+    assert classify_page(text) == (PAGE_TERMINAL, None)
+    assert scan_page(text, 3)['terminal']['address'] == '400 Birmingham Hwy, Chattanooga, TN 37419'
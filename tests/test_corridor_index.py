@@ -0,0 +1,59 @@
+import pytest
+
+from corridor_index import CorridorIndex, parse_exit_info, parse_highway
+
+
+@pytest.mark.parametrize('exit_info, expected', [
+    ('I-20/I-59, Exit 77', [('I-20', 77, '77', None), ('I-59', 77, '77', None)]),
+    ('I-80, Exit 151(W)/149(E)', [('I-80', 151, '151', 'W'), ('I-80', 149, '149', 'E')]),
+    ('1-90, Exit 5', [('I-90', 5, '5', None)]),
+    ('I-77, Exit 41/I-81, Exit 72', [('I-77', 41, '41', None), ('I-81', 72, '72', None)]),
+    ('I-81 N, Exit 45/45A', [('I-81', 45, '45', 'N'), ('I-81', 45, '45A', 'N')]),
+    ('US 441', [('US-441', None, None, None)]),
+    ('Tpike MM 12', [('TPIKE', 12, '12', None)]),
+    (None, []),
+])
+def test_parse_exit_info(exit_info, expected):
+    assert parse_exit_info(exit_info) == expected
+
+
+def test_parse_highway():
+    assert parse_highway('i85') == 'I-85'
+    assert parse_highway('U.S. 75') == 'US-75'
+    assert parse_highway('Main St') is None
+
+
+@pytest.fixture
+def index():
+    stations = [{'name': name, 'exit_info': exit_info} for name, exit_info in [
+        ('A', 'I-85, Exit 10'),
+        ('B', 'I-85, Exit 45/45A'),
+        ('C', 'I-85, Exit 120(N)'),
+        ('D', 'I-85, Exit 121(S)'),
+        ('E', 'I-85'),
+    ]]
+    return CorridorIndex(stations)
+
+
+def names(results):
+    return [station['name'] for _, station in results]
+
+
+def test_between_bounds_are_inclusive(index):
+    assert names(index.between('I-85', 10, 120)) == ['A', 'B', 'C']
+    assert names(index.between('I-85', 11, 119)) == ['B']
+    assert names(index.between('I-85', 45, 45)) == ['B']
+    assert names(index.between('I-85', 200, 300)) == []
+
+
+def test_between_open_and_reversed_bounds(index):
+    assert names(index.between('I-85')) == ['A', 'B', 'C', 'D']
+    assert names(index.between('I-85', start=100)) == ['C', 'D']
+    assert names(index.between('I-85', end=45)) == ['A', 'B']
+    assert names(index.between('i85', 121, 10)) == ['D', 'C', 'B', 'A']
+
+
+def test_between_direction(index):
+    assert names(index.between('I-85', 100, 130, direction='N')) == ['C']
+    assert names(index.between('I-85', 100, 130, direction='S')) == ['D']
+    assert [station['name'] for station in index.unnumbered['I-85']] == ['E']
@@ -0,0 +1,94 @@
+from dedupe import DedupeIndex, dedupe_stations
+from station_table import StationTable
+
+
+def station(number, navigo=None, brand='TA', **fields):
+    return dict(number=number, navigo_id=navigo, type=brand, name=f"#{number} {brand}", **fields)
+
+
+def conflict_types(index):
+    return [conflict['type'] for conflict in index.conflicts]
+
+
+def test_duplicate_is_merged():
+    index = DedupeIndex()
+    index.add('TEXAS', station('1', 'CVEN-1', page=3))
+    index.add('OKLAHOMA', station('1', None, page=9, city_state_zip='Dallas, TX 75001'))
+    assert len(index.kept) == 1
+    assert index.kept[0][1]['city_state_zip'] == 'Dallas, TX 75001'
+    assert index.duplicates[0]['merged_fields'] == ['city_state_zip']
+    assert index.duplicates[0]['dropped'] == {'region': 'OKLAHOMA', 'page': 9}
+    assert index.conflicts == []
+
+
+def test_merged_key_matches_later_duplicate():
+    index = DedupeIndex()
+    index.add('TEXAS', station('1'))
+    index.add('TEXAS', station('1', 'CVEN-1'))
+    index.add('TEXAS', {'navigo_id': 'cven-1', 'name': 'no number'})
+    assert len(index.kept) == 1
+    assert len(index.duplicates) == 2
+
+
+def test_field_conflict():
+    index = DedupeIndex()
+    index.add('TEXAS', station('1', 'CVEN-1', city_state_zip='Dallas, TX 75001'))
+    index.add('TEXAS', station('1', 'CVEN-1', city_state_zip='Austin, TX 73301'))
+    assert conflict_types(index) == ['field_conflict']
+    conflict = index.conflicts[0]
+    assert conflict['field'] == 'city_state_zip'
+    assert conflict['values'] == ['Dallas, TX 75001', 'Austin, TX 73301']
+    assert len(index.kept) == 1
+
+
+def test_navigo_mismatch():
+    index = DedupeIndex()
+    index.add('TEXAS', station('1', 'CVEN-1'))
+    index.add('TEXAS', station('1', 'CVEN-2'))
+    assert conflict_types(index) == ['navigo_mismatch']
+    assert len(index.kept) == 2
+
+
+def test_navigo_collision():
+    index = DedupeIndex()
+    index.add('TEXAS', station('1', 'CVEN-1'))
+    index.add('GEORGIA', station('5', 'CVEN-1'))
+    assert conflict_types(index) == ['navigo_collision']
+    assert [occurrence['region'] for occurrence in index.conflicts[0]['occurrences']] == ['TEXAS', 'GEORGIA']
+    assert len(index.kept) == 2
+
+
+def test_ambiguous_match():
+    index = DedupeIndex()
+    index.add('TEXAS', station('1', 'CVEN-1'))
+    index.add('TEXAS', station('2', 'CVEN-2'))
+    index.add('TEXAS', station('2', 'CVEN-1'))
+    assert conflict_types(index) == ['ambiguous_match']
+    assert len(index.kept) == 3
+
+
+def test_same_number_other_brand_is_kept():
+    index = DedupeIndex()
+    index.add('TEXAS', station('1', brand='TA'))
+    index.add('TEXAS', station('1', brand='Petro'))
+    assert len(index.kept) == 2
+    assert index.conflicts == []
+
+
+def test_dedupe_stations_dict_and_table():
+    data = {
+        'TEXAS': {'terminals': [{'name': 'Covenant Logistics: Dallas, TX'}],
+                  'fuel_stations': [station('1', 'CVEN-1', page=1)]},
+        'OKLAHOMA': {'terminals': [], 'fuel_stations': [station('1', 'CVEN-1', page=2),
+                                                        station('2', 'CVEN-2', page=2)]},
+    }
+    deduped, report = dedupe_stations(data)
+    assert [s['number'] for s in deduped['TEXAS']['fuel_stations']] == ['1']
+    assert [s['number'] for s in deduped['OKLAHOMA']['fuel_stations']] == ['2']
+    assert deduped['TEXAS']['terminals'] == data['TEXAS']['terminals']
+    assert (report['stations_in'], report['stations_out']) == (3, 2)
+
+    table_deduped, table_report = dedupe_stations(StationTable.from_dict(data))
+    assert isinstance(table_deduped, StationTable)
+    assert table_report['stations_out'] == 2
+    assert table_deduped.to_dict()['OKLAHOMA']['fuel_stations'][0]['number'] == '2'
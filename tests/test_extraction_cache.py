@@ -0,0 +1,21 @@
+from extraction_cache import ExtractionCache
+
+
+def test_cache_hits_do_not_hold_the_write_lock(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    with ExtractionCache(path) as cache:
+        cache.put_pages('hash', 'method', {1: 'one'})
+
+    reader = ExtractionCache(path)
+    other = ExtractionCache(path)
+    other.conn.execute("PRAGMA busy_timeout = 100")
+    try:
+        assert reader.get_pages('hash', 'method') == {1: 'one'}
+        assert reader.get('hash', 1, 'method') == 'one'
+        # Another process storing pages while the reader keeps working
+        other.put_pages('hash', 'method', {2: 'two'})
+    finally:
+        reader.close()
+        other.close()
+    with ExtractionCache(path) as cache:
+        assert cache.get_pages('hash', 'method') == {1: 'one', 2: 'two'}
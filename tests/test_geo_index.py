@@ -0,0 +1,71 @@
+import math
+import random
+
+import pytest
+
+from geo_index import (
+    DEFAULT_ZIP_TABLE, EARTH_RADIUS_MILES, KDTree, StationIndex, _to_xyz, load_zip_centroids
+)
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+def random_points(count, seed):
+    rng = random.Random(seed)
+    return [(rng.uniform(25, 49), rng.uniform(-124, -67)) for _ in range(count)]
+
+
+@pytest.fixture
+def index():
+    points = random_points(500, 1)
+    stations = [{'name': f"#{i:03d}", 'lat': lat, 'lon': lon,
+                 'site_type': 'Exclusive' if i % 3 == 0 else 'Primary'}
+                for i, (lat, lon) in enumerate(points)]
+    return StationIndex(stations, {})
+
+
+def brute_force(index, lat, lon, site_type=None):
+    return sorted((haversine_miles(lat, lon, *position), station['name'])
+                  for position, station in zip(index.coordinates, index.stations)
+                  if site_type is None or station['site_type'] == site_type)
+
+
+@pytest.mark.parametrize('site_type', [None, 'Exclusive'])
+def test_nearest_matches_brute_force(index, site_type):
+    for lat, lon in random_points(25, 2):
+        expected = brute_force(index, lat, lon, site_type)[:7]
+        found = index.nearest(lat, lon, 7, site_type=site_type)
+        assert [station['name'] for _, station in found] == [name for _, name in expected]
+        assert [miles for miles, _ in found] == pytest.approx([miles for miles, _ in expected])
+
+
+def test_within_radius_matches_brute_force(index):
+    for lat, lon in random_points(25, 3):
+        expected = [name for miles, name in brute_force(index, lat, lon) if miles <= 150]
+        assert [station['name'] for _, station in index.within_radius(lat, lon, 150)] == expected
+
+
+def test_nearest_k_bounds(index):
+    assert len(index.nearest(40, -90, len(index.stations) + 10)) == len(index.stations)
+    with pytest.raises(ValueError):
+        KDTree([_to_xyz(40, -90)]).nearest(_to_xyz(40, -90), 0)
+
+
+def test_stations_geocoded_by_zip():
+    centroids = {'37419': (35.0331, -85.3687)}
+    stations = [{'name': 'A', 'city_state_zip': 'Chattanooga, TN 37419'},
+                {'name': 'B', 'city_state_zip': 'Nowhere, TN 00000'}]
+    index = StationIndex(stations, centroids)
+    assert [station['name'] for station in index.stations] == ['A']
+    assert [station['name'] for station in index.ungeocoded] == ['B']
+
+
+def test_bundled_zip_table():
+    centroids = load_zip_centroids(DEFAULT_ZIP_TABLE)
+    lat, lon = centroids['37419']
+    assert haversine_miles(lat, lon, 35.05, -85.31) < 10
@@ -0,0 +1,53 @@
+import pytest
+
+from search_index import MIN_PREFIX_LENGTH, SearchIndex
+
+DATA = {
+    'TEXAS': {'terminals': [], 'fuel_stations': [
+        {'number': '102', 'name': '#102 TA Dallas', 'city_state_zip': 'Dallas, TX 75001',
+         'exit_info': 'I-20, Exit 1', 'navigo_id': 'CVEN-TA102'},
+        {'number': '103', 'name': '#103 TA Bar', 'city_state_zip': 'Bar, TX 75002'},
+    ]},
+    'CALIFORNIA': {'terminals': [], 'fuel_stations': [
+        {'number': '200', 'name': '#200 Petro Barstow', 'city_state_zip': 'Barstow, CA 92311'},
+    ]},
+    'COVENANT_TERMINALS': {'terminals': [
+        {'name': 'Covenant Logistics: Chattanooga, TN',
+         'address': '400 Birmingham Hwy\nChattanooga, TN 37419'},
+    ], 'fuel_stations': []},
+}
+
+
+@pytest.fixture
+def index():
+    return SearchIndex.build(DATA)
+
+
+def test_short_terms_match_whole_tokens_only(index):
+    assert MIN_PREFIX_LENGTH == 3
+    assert index.search('da') == []
+    assert index.search('tx') == ['TEXAS-102', 'TEXAS-103']
+    assert index.search('ca') == ['CALIFORNIA-200']
+
+
+def test_prefix_at_min_length(index):
+    assert index.search('dal') == ['TEXAS-102']
+    assert index.search('cha') == ['COVENANT-0']
+
+
+def test_exact_match_ranks_above_prefix(index):
+    assert index.search('bar') == ['TEXAS-103', 'CALIFORNIA-200']
+
+
+def test_terms_combine_and_special_tokens(index):
+    assert index.search('bar california') == ['CALIFORNIA-200']
+    assert index.search('I 20') == ['TEXAS-102']
+    assert index.search('cven-ta102') == ['TEXAS-102']
+    assert index.search('bar', limit=1) == ['TEXAS-103']
+
+
+def test_export_round_trip(index):
+    loaded = SearchIndex.from_dict(index.to_dict())
+    assert loaded.search('bar') == index.search('bar')
+    with pytest.raises(ValueError):
+        SearchIndex.from_dict(dict(index.to_dict(), version=0))
@@ -0,0 +1,43 @@
+import pytest
+
+from snapshot import Snapshot, write_snapshot
+from station_table import StationTable
+
+DATA = {
+    'TEXAS': {'terminals': [], 'fuel_stations': [
+        {'page': 4, 'state': 'TEXAS', 'number': '102', 'type': 'TA', 'name': '#102 TA Bar',
+         'address': '12 Main St', 'city_state_zip': 'Bar, TX 75001', 'exit_info': 'I-20, Exit 1',
+         'phone': '(512) 555-0102', 'navigo_id': 'CVEN-TA102', 'site_type': 'Exclusive'},
+        {'page': 5, 'state': 'TEXAS', 'number': '007', 'type': 'Petro', 'name': '#007 Petro Café',
+         'site_type': 'Primary', 'source': 'a/book.pdf'},
+    ]},
+    'OHIO': {'terminals': [], 'fuel_stations': []},
+    'COVENANT_TERMINALS': {'terminals': [{'page': 10, 'name': 'Covenant Logistics: X',
+                                          'amenities': ['Showers']}], 'fuel_stations': []},
+}
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'stations.fbsnap'
+    write_snapshot(DATA, path)
+    with Snapshot(path) as snapshot:
+        assert snapshot.to_dict() == DATA
+        assert snapshot.regions() == ['TEXAS', 'OHIO', 'COVENANT_TERMINALS']
+        assert snapshot.station_count_for('TEXAS') == 2
+        assert snapshot.station('TEXAS', 1)['name'] == '#007 Petro Café'
+        with pytest.raises(IndexError):
+            snapshot.station('OHIO', 0)
+
+
+def test_table_round_trip(tmp_path):
+    path = tmp_path / 'stations.fbsnap'
+    write_snapshot(StationTable.from_dict(DATA), path)
+    with Snapshot(path) as snapshot:
+        assert snapshot.to_dict() == DATA
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'not_a_snapshot'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        Snapshot(path)
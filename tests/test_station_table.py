@@ -0,0 +1,30 @@
+from station_table import MISSING, StationTable
+
+
+def test_round_trip():
+    data = {
+        'TEXAS': {'terminals': [], 'fuel_stations': [
+            {'page': 4, 'state': 'TEXAS', 'number': '102', 'type': 'TA', 'name': '#102 TA Bar',
+             'site_type': 'Exclusive'},
+        ]},
+        'COVENANT_TERMINALS': {'terminals': [{'name': 'Covenant Logistics: X'}], 'fuel_stations': []},
+    }
+    assert StationTable.from_dict(data).to_dict() == data
+
+
+def test_numbers_and_pages_without_an_int_form_are_kept():
+    table = StationTable()
+    stations = [
+        {'page': None, 'number': '12A', 'name': 'A'},
+        {'page': 3, 'number': '7', 'name': 'B'},
+        {'page': '3', 'number': None, 'name': 'C'},
+    ]
+    table.extend('TEXAS', stations)
+    assert list(table.columns['number']) == [MISSING, MISSING, MISSING]
+    assert list(table.columns['page']) == [MISSING, 3, MISSING]
+    assert [station for _, station in table.iter_stations()] == [
+        {'number': '12A', 'name': 'A'},
+        {'page': 3, 'number': '7', 'name': 'B'},
+        {'page': '3', 'name': 'C'},
+    ]
+    assert table.column('number', range(3)) == ['12A', '7', None]
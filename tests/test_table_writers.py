@@ -0,0 +1,19 @@
+import pytest
+
+from table_writers import ColumnarTableWriter
+
+pa = pytest.importorskip('pyarrow')
+
+
+def test_columnar_rows_keep_column_positions(tmp_path):
+    path = tmp_path / 'tables.arrow'
+    writer = ColumnarTableWriter(path)
+    writer.write_table(3, 1, [['Name', None, 'Name'], ['a', 'b', 'c', 'd'], ['e']])
+    writer.close()
+
+    with pa.ipc.open_file(str(path)) as reader:
+        cells = reader.read_all().to_pylist()
+    assert [(cell['row'], cell['column_index'], cell['column'], cell['value']) for cell in cells] == [
+        (1, 0, 'Name', 'a'), (1, 1, None, 'b'), (1, 2, 'Name', 'c'), (1, 3, None, 'd'),
+        (2, 0, 'Name', 'e'), (2, 1, None, None), (2, 2, 'Name', None),
+    ]
@@ -0,0 +1,79 @@
+from extract_fuel_data import parse_covenant_terminal
+from station_patterns import terminal_fields
+
+
+TERMINAL_PAGE = """Covenant Logistics: Chattanooga, TN
+400 Birmingham Hwy, Chattanooga, TN 37419
+Phone: (423) 821-1212
+NAVIGO ID: CVEN-CHA
+AMENITIES:
+- Showers
+- Laundry
+SHOWERS: 4
+PARKING SPOTS: 120
+SHOP: YES
+"""
+
+# A stray number before the street line must not start an address match
+# that runs over the fields after it
+STRAY_NUMBER_PAGE = """Covenant Logistics: Dallas, TX
+OPEN 24 HOURS
+AMENITIES:
+- Showers
+SHOWERS: 2
+PARKING SPOTS: 40
+SHOP: NO
+Phone: (214) 555-0100
+NAVIGO ID: CVEN-T01
+400 Main St, Dallas, TX 75001
+"""
+
+
+def test_terminal_page():
+    assert parse_covenant_terminal(TERMINAL_PAGE, 10) == {
+        'page': 10,
+        'type': 'Covenant Terminal',
+        'name': 'Covenant Logistics: Chattanooga, TN',
+        'address': '400 Birmingham Hwy, Chattanooga, TN 37419',
+        'phone': '(423) 821-1212',
+        'navigo_id': 'CVEN-CHA',
+        'amenities': ['Showers', 'Laundry'],
+        'showers': '4',
+        'parking': '120',
+        'shop': 'YES',
+    }
+
+
+def test_stray_number_does_not_swallow_fields():
+    terminal = parse_covenant_terminal(STRAY_NUMBER_PAGE, 3)
+    assert terminal['address'] == '400 Main St, Dallas, TX 75001'
+    assert terminal['phone'] == '(214) 555-0100'
+    assert terminal['navigo_id'] == 'CVEN-T01'
+    assert terminal['amenities'] == ['Showers']
+    assert (terminal['showers'], terminal['parking'], terminal['shop']) == ('2', '40', 'NO')
+
+
+def test_empty_label_keeps_next_label():
+    fields = terminal_fields("Covenant Logistics: X\nSHOP:\nAMENITIES:\n- Showers\n")
+    assert fields['shop'] == 'NO'
+    assert fields['amenities'] == ['Showers']
+
+
+def test_detail_lines():
+    fields = terminal_fields(lines=['Address: 400 Birmingham Hwy, Chattanooga, TN 37419',
+                                    'Phone: (423) 821-1212', 'NaviGo ID: CVEN-CHA'])
+    assert fields == {'address': '400 Birmingham Hwy, Chattanooga, TN 37419',
+                      'phone': '(423) 821-1212', 'navigo_id': 'CVEN-CHA'}
+
+
+def test_two_line_address():
+    terminal = parse_covenant_terminal(
+        "Covenant Logistics: Chattanooga, TN\n400 Birmingham Hwy\nChattanooga, TN 37419\n"
+        "Phone: (423) 821-1212\n", 10)
+    assert terminal['address'] == '400 Birmingham Hwy\nChattanooga, TN 37419'
+    assert terminal['phone'] == '(423) 821-1212'
+
+
+def test_empty_showers_keeps_parking():
+    fields = terminal_fields("Covenant Logistics: X\nSHOWERS:\nPARKING SPOTS: 12\n")
+    assert (fields['showers'], fields['parking']) == ('NO', '12')
@@ -0,0 +1,32 @@
+import pdf_extractor
+from extraction_cache import ExtractionCache, file_hash
+from pdf_extractor import PDFExtractor
+
+
+def test_fallback_pages_are_cached_under_their_backend(tmp_path, monkeypatch):
+    pdf_path = tmp_path / 'book.pdf'
+    pdf_path.write_bytes(b'%PDF-1.4 test')
+    runs = []
+
+    def fake_backend_text(path, names, start=0, stop=None):
+        runs.append(tuple(names))
+        yield 'pymupdf', 'page one'
+        yield names[-1], 'page two (fallback)'
+
+    monkeypatch.setattr(pdf_extractor, 'iter_backend_text', fake_backend_text)
+    with ExtractionCache(tmp_path / 'cache.sqlite') as cache:
+        extractor = PDFExtractor(pdf_path, cache=cache)
+        extractor._ranked_backends = ['pymupdf', 'pdfplumber']
+        expected = [(1, 'page one'), (2, 'page two (fallback)')]
+        assert list(extractor.iter_text('auto')) == expected
+
+        digest = file_hash(pdf_path)
+        assert cache.get_pages(digest, 'text:pymupdf') == {1: 'page one'}
+        assert cache.get_pages(digest, 'text:pdfplumber') == {2: 'page two (fallback)'}
+
+        # The same backends are served from the cache...
+        assert list(extractor.iter_text('auto')) == expected
+        assert runs == [('pymupdf', 'pdfplumber')]
+        # ...but pymupdf alone does not pass off the fallback page as its own
+        list(extractor.iter_text('pymupdf'))
+        assert runs[-1] == ('pymupdf',)
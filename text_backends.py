@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Pluggable page-level text extraction backends.
+Every backend opens a document once and returns the text of single pages,
+so callers can stream pages, split them across processes or switch
+backend for one page. rank_backends() times each backend on a few sample
+pages and puts the fastest one whose text passes validation first.
+"""
+
+import re
+import time
+
+from lazy_imports import LazyModule
+
+# Backend libraries are imported when a backend is first opened
+fitz = LazyModule('fitz')  # PyMuPDF
+pdfplumber = LazyModule('pdfplumber')
+pypdf = LazyModule('pypdf')
+
+# name -> backend class, in default preference order
+BACKENDS = {}
+
+# Undecodable glyphs: replacement characters and pdfminer "(cid:123)" codes
+GARBLED_PATTERN = re.compile(r'\ufffd|\(cid:[0-9]+\)')
+
+# A page whose text is more than this share garbled glyphs fails validation
+MAX_GARBLED_RATIO = 0.05
+
+
+def register_backend(cls):
+    """Class decorator adding a backend to BACKENDS under cls.name."""
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+class TextBackend:
+    """Base class: open the document in __init__ and set page_count."""
+
+    name = None
+    page_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def page_text(self, index):
+        """Text of the page at 0-based index."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+@register_backend
+class PyMuPDFBackend(TextBackend):
+    name = 'pymupdf'
+
+    def __init__(self, pdf_path):
+        self.doc = fitz.open(pdf_path)
+        self.page_count = self.doc.page_count
+
+    def page_text(self, index):
+        return self.doc[index].get_text()
+
+    def close(self):
+        self.doc.close()
+
+
+@register_backend
+class PdfplumberBackend(TextBackend):
+    name = 'pdfplumber'
+
+    def __init__(self, pdf_path):
+        self.pdf = pdfplumber.open(pdf_path)
+        self.page_count = len(self.pdf.pages)
+
+    def page_text(self, index):
+        return self.pdf.pages[index].extract_text() or ""
+
+    def close(self):
+        self.pdf.close()
+
+
+@register_backend
+class PypdfBackend(TextBackend):
+    name = 'pypdf'
+
+    def __init__(self, pdf_path):
+        self.file = open(pdf_path, 'rb')
+        self.reader = pypdf.PdfReader(self.file)
+        self.page_count = len(self.reader.pages)
+
+    def page_text(self, index):
+        return self.reader.pages[index].extract_text()
+
+    def close(self):
+        self.file.close()
+
+
+def validate_page_text(text):
+    """True when text is a string that is not mostly undecodable glyphs."""
+    if not isinstance(text, str):
+        return False
+    garbled = sum(len(match) for match in GARBLED_PATTERN.findall(text))
+    return garbled <= MAX_GARBLED_RATIO * len(text)
+
+
+def sample_pages(page_count, sample_size):
+    """Evenly spaced page indexes, always including the first page."""
+    if page_count <= sample_size:
+        return list(range(page_count))
+    step = page_count / sample_size
+    return [int(i * step) for i in range(sample_size)]
+
+
+def rank_backends(pdf_path, sample_size=3, names=None):
+    """Backend names ordered for pdf_path, best first.
+
+    Each backend extracts the same sample pages, timed after an untimed
+    warm-up open. Backends whose sample passes validation and recovers
+    text on as many pages as any other come first, fastest first; the
+    rest follow as fallbacks.
+    """
+    trials = []
+    for name in names or BACKENDS:
+        try:
+            # Untimed warm-up: the backend's lazy import and first-page setup
+            # would otherwise count against whichever backend runs first
+            with BACKENDS[name](pdf_path) as backend:
+                if backend.page_count:
+                    backend.page_text(0)
+        except Exception:
+            continue
+        start = time.perf_counter()
+        try:
+            with BACKENDS[name](pdf_path) as backend:
+                texts = [backend.page_text(index)
+                         for index in sample_pages(backend.page_count, sample_size)]
+        except Exception:
+            continue
+        elapsed = time.perf_counter() - start
+        valid = all(validate_page_text(text) for text in texts)
+        pages_with_text = sum(1 for text in texts if text.strip()) if valid else -1
+        trials.append((name, elapsed, pages_with_text))
+
+    if not trials:
+        raise RuntimeError(f"No text backend could open {pdf_path}")
+    most_text = max(pages_with_text for _, _, pages_with_text in trials)
+    trials.sort(key=lambda trial: (trial[2] < most_text, trial[1]))
+    return [name for name, _, _ in trials]
+
+
+def iter_backend_text(pdf_path, names, start=0, stop=None):
+    """Yield (backend name, text) of pages [start, stop) using the first backend in names.
+
+    A page the first backend fails on (an exception or text that fails
+    validation) is retried with the next backend, and so on. Other
+    backends are only opened when a page needs them.
+    """
+    opened = {}
+    failed = set()  # backends that could not open the document
+
+    def backend(name):
+        if name not in opened:
+            opened[name] = BACKENDS[name](pdf_path)
+        return opened[name]
+
+    try:
+        if stop is None:
+            stop = _page_count(names, backend, failed)
+        for index in range(start, stop):
+            fallback = None
+            fallback_name = None
+            error = None
+            for name in names:
+                if name in failed:
+                    continue
+                try:
+                    text = backend(name).page_text(index)
+                except Exception as e:
+                    if name not in opened:
+                        failed.add(name)
+                    error = e
+                    continue
+                if validate_page_text(text):
+                    break
+                if fallback is None:
+                    fallback, fallback_name = text, name
+            else:
+                if fallback is None:
+                    raise RuntimeError(f"No text backend could extract page {index + 1} of {pdf_path}") from error
+                text, name = fallback, fallback_name
+            yield name, text
+    finally:
+        for opened_backend in opened.values():
+            opened_backend.close()
+
+
+def _page_count(names, backend, failed):
+    for name in names:
+        try:
+            return backend(name).page_count
+        except Exception:
+            failed.add(name)
+    raise RuntimeError("No text backend could open the document")